@@ -0,0 +1,353 @@
+"""Offline end-to-end load test against local fake providers.
+
+Usage:
+    python benchmarks/bench_e2e.py [--levels 1,4,16] [--requests 20] [--mode agent|route|both]
+                                   [--llm-latency MS] [--search-latency MS] [--email-latency MS]
+                                   [--page-latency MS] [--error-rate P] [--throttle-rate P]
+                                   [--real-limits] [--verbose] [--output results.json]
+
+Starts fake LLM (OpenAI chat completions), Tavily, FindyMail and static
+company/LinkedIn page servers in a child process, points the app at them with
+TAVILY_BASE_URL, LLM_API_BASE and FINDYMAIL_BASE_URL, and then drives
+``CompanyResearchAgent.process_company`` (``--mode agent``) and the
+``/research`` route (``--mode route``) at each concurrency level. Reports
+throughput, p50/p95/p99 latency and the process's peak RSS so far.
+
+Every request researches a differently named company, but they all share
+the fake servers' host, so people lookups repeat across companies. The LLM,
+search, page and email caches are therefore turned off, and each run uses a
+fresh database, so every request pays for all of its provider calls.
+Provider rate limits are raised out of the way unless ``--real-limits`` is
+given; latencies are per request with +/-50% jitter.
+"""
+import argparse
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import random
+import resource
+import socket
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TITLES = "CEO, CTO, VP Sales"
+
+# ---------------------------------------------------------------------------
+# Fake providers, run in a child process
+
+def _slug(text: str) -> str:
+    return hashlib.sha1(text.encode()).hexdigest()[:10]
+
+def _company_page(name: str) -> str:
+    paragraphs = ''.join(
+        f"<p>{name} helps mid-market logistics teams plan routes and track shipments. "
+        f"Section {i} covers pricing, integrations and customer stories in detail.</p>"
+        for i in range(40)
+    )
+    return (f"<html><head><title>{name}</title><script>var x = 1;</script></head>"
+            f"<body><nav>Home</nav><h1>{name}</h1>{paragraphs}<footer>(c) {name}</footer></body></html>")
+
+def _profile_page(slug: str) -> str:
+    return (f"<html><body><h1>Jordan Bench{slug}</h1><p>Head of something at a company.</p>"
+            + ''.join(f"<p>Experience entry {i} at a previous employer.</p>" for i in range(20))
+            + "</body></html>")
+
+def _completion(messages) -> str:
+    system = next((m['content'] for m in messages if m['role'] == 'system'), '')
+    user = next((m['content'] for m in messages if m['role'] == 'user'), '')
+    if 'challenges' in system:
+        return json.dumps({"challenges": [{
+            "category": "OPERATIONAL",
+            "description": f"Challenge {i}",
+            "impact_level": "HIGH",
+            "timeframe": "IMMEDIATE",
+            "context": "Benchmark context",
+            "reasoning": "Benchmark reasoning",
+            "software_solution_category": "CRM",
+            "solution_description": "A CRM",
+            "solution_key_features": ["a", "b", "c"],
+            "solution_implementation_considerations": "None",
+            "sources": []
+        } for i in range(3)]})
+    if 'LinkedIn' in system:
+        return json.dumps({"first_name": "Jordan", "last_name": f"Bench{_slug(user)}"})
+    return "A logistics software company that helps teams plan routes and track shipments."
+
+def serve_fakes(port: int, options: dict, ready) -> None:
+    import asyncio
+    from aiohttp import web
+
+    rng = random.Random(options['seed'])
+
+    async def delay(ms: float) -> None:
+        if ms > 0:
+            await asyncio.sleep(ms * rng.uniform(0.5, 1.5) / 1000)
+
+    def fault():
+        roll = rng.random()
+        if roll < options['throttle_rate']:
+            return web.json_response({'error': 'throttled'}, status=429, headers={'Retry-After': '0'})
+        if roll < options['throttle_rate'] + options['error_rate']:
+            return web.json_response({'error': 'injected'}, status=500)
+        return None
+
+    async def chat_completions(request):
+        await delay(options['llm_latency'])
+        failure = fault()
+        if failure is not None:
+            return failure
+        body = await request.json()
+        content = _completion(body['messages'])
+        prompt_tokens = sum(len(m['content']) for m in body['messages']) // 4
+        return web.json_response({
+            "id": "chatcmpl-bench", "object": "chat.completion", "created": int(time.time()),
+            "model": body.get('model', 'gpt-4o-mini'),
+            "choices": [{"index": 0, "finish_reason": "stop",
+                         "message": {"role": "assistant", "content": content}}],
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": len(content) // 4,
+                      "total_tokens": prompt_tokens + len(content) // 4}
+        })
+
+    async def search(request):
+        await delay(options['search_latency'])
+        failure = fault()
+        if failure is not None:
+            return failure
+        body = await request.json()
+        query = body['query']
+        base = f"http://127.0.0.1:{port}"
+        if 'linkedin' in query:
+            results = [{"url": f"{base}/linkedin.com/in/{_slug(query)}", "title": query,
+                        "content": f"Profile matching {query}", "score": 0.9}]
+        else:
+            results = [{"url": f"{base}/news/{_slug(query)}-{i}", "title": query,
+                        "content": f"Result {i} for {query}: the company raised funding and grew its team.",
+                        "score": 0.8} for i in range(body.get('max_results', 2))]
+        return web.json_response({"query": query, "results": results})
+
+    async def find_email(request):
+        await delay(options['email_latency'])
+        failure = fault()
+        if failure is not None:
+            return failure
+        body = await request.json()
+        # Random local parts, so the pattern learner never short-circuits the lookup
+        return web.json_response({"contact": {"email": f"{_slug(body['name'] + str(rng.random()))}@{body['domain']}"}})
+
+    async def company(request):
+        await delay(options['page_latency'])
+        return web.Response(text=_company_page(request.match_info['name']), content_type='text/html')
+
+    async def profile(request):
+        await delay(options['page_latency'])
+        return web.Response(text=_profile_page(request.match_info['slug']), content_type='text/html')
+
+    app = web.Application()
+    app.router.add_post('/chat/completions', chat_completions)
+    app.router.add_post('/search', search)
+    app.router.add_post('/api/search/name', find_email)
+    app.router.add_get('/company/{name}', company)
+    app.router.add_get('/linkedin.com/in/{slug}', profile)
+
+    async def main():
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        await web.TCPSite(runner, '127.0.0.1', port).start()
+        ready.set()
+        await asyncio.Event().wait()
+
+    asyncio.run(main())
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+# ---------------------------------------------------------------------------
+# Load driver
+
+def configure_env(base_url: str, tmp: str, real_limits: bool) -> None:
+    """Point the app at the fakes; must run before anything under src is imported"""
+    os.environ.update({
+        'TAVILY_BASE_URL': base_url,
+        'LLM_API_BASE': base_url,
+        'FINDYMAIL_BASE_URL': base_url,
+        'TAVILY_API_KEY': 'tvly-bench',
+        'OPENAI_API_KEY': 'sk-bench',
+        'FINDYMAIL_API_KEY': 'bench',
+        'DATABASE_PATH': os.path.join(tmp, 'bench.sqlite'),
+        'SOLUTIONS_PATH': os.path.join(tmp, 'solutions.json'),
+        'LITELLM_LOCAL_MODEL_COST_MAP': 'True',
+        # Company names differ but the host does not, so cached people lookups would flatter the numbers
+        'LLM_CACHE_ENABLED': 'false',
+        'SEARCH_CACHE_MAX_BYTES': '0',
+        'PAGE_CACHE_MAX_BYTES': '0',
+        'EMAIL_CACHE_TTL': '0',
+        'EMAIL_CACHE_MISS_TTL': '0',
+    })
+    with open(os.environ['SOLUTIONS_PATH'], 'w') as f:
+        json.dump({"CRM": {"name": "Bench CRM", "implementation_time": "1 month",
+                           "integration_points": [], "impact": {}}}, f)
+    if not real_limits:
+        for name in ('TAVILY', 'LLM', 'FINDYMAIL', 'HOST'):
+            os.environ[f'{name}_RATE'] = '100000'
+            os.environ[f'{name}_BURST'] = '100000'
+        # Every fake page lives on one host
+        os.environ['SCRAPE_MAX_PER_HOST'] = '1000'
+        os.environ['HTTP_POOL_LIMIT_PER_HOST'] = '0'
+
+def percentile(values, pct: float) -> float:
+    """Nearest-rank percentile of a non-empty list"""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+def summarize(mode: str, level: int, latencies, errors: int, elapsed: float) -> dict:
+    return {
+        'mode': mode,
+        'concurrency': level,
+        'requests': len(latencies) + errors,
+        'errors': errors,
+        'throughput': (len(latencies) + errors) / elapsed if elapsed else 0.0,
+        'p50': percentile(latencies, 50) if latencies else None,
+        'p95': percentile(latencies, 95) if latencies else None,
+        'p99': percentile(latencies, 99) if latencies else None,
+        'peak_rss_mb': peak_rss_mb(),
+    }
+
+def run_agent_level(base_url: str, level: int, requests: int, tag: str) -> dict:
+    import asyncio
+    from src.research.agent import get_research_agent
+    from src.research.runtime import runtime
+
+    agent = get_research_agent()
+
+    async def one(i: int, latencies, failures):
+        started = time.perf_counter()
+        try:
+            result = await agent.process_company(f"{base_url}/company/{tag}-{level}-{i}", TITLES)
+            if not result.get('company'):
+                raise ValueError('empty result')
+            latencies.append(time.perf_counter() - started)
+        except Exception:
+            failures.append(i)
+
+    async def drive():
+        latencies, failures = [], []
+        semaphore = asyncio.Semaphore(level)
+
+        async def bounded(i):
+            async with semaphore:
+                await one(i, latencies, failures)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(bounded(i) for i in range(requests)))
+        return latencies, failures, time.perf_counter() - started
+
+    latencies, failures, elapsed = runtime.run(drive())
+    return summarize('agent', level, latencies, len(failures), elapsed)
+
+def run_route_level(app, base_url: str, level: int, requests: int, tag: str) -> dict:
+    def one(i: int):
+        started = time.perf_counter()
+        response = app.test_client().post('/research', data={
+            'website': f"{base_url}/company/{tag}-route-{level}-{i}", 'titles': TITLES
+        })
+        ok = response.status_code == 200 and response.get_json().get('success')
+        return ok, time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=level) as pool:
+        outcomes = list(pool.map(one, range(requests)))
+    elapsed = time.perf_counter() - started
+    latencies = [latency for ok, latency in outcomes if ok]
+    return summarize('route', level, latencies, len(outcomes) - len(latencies), elapsed)
+
+def format_row(row: dict) -> str:
+    def ms(value):
+        return f"{value * 1000:8.0f}" if value is not None else f"{'-':>8}"
+    return (f"{row['mode']:<6} {row['concurrency']:>5} {row['requests']:>6} {row['errors']:>6} "
+            f"{row['throughput']:>9.2f} {ms(row['p50'])} {ms(row['p95'])} {ms(row['p99'])} "
+            f"{row['peak_rss_mb']:>9.1f}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--levels', default='1,4,16', help='Comma-separated concurrency levels')
+    parser.add_argument('--requests', type=int, default=20, help='Requests per level (at least the level)')
+    parser.add_argument('--mode', choices=['agent', 'route', 'both'], default='both')
+    parser.add_argument('--llm-latency', type=float, default=300, help='Mean fake LLM latency (ms)')
+    parser.add_argument('--search-latency', type=float, default=150, help='Mean fake Tavily latency (ms)')
+    parser.add_argument('--email-latency', type=float, default=100, help='Mean fake FindyMail latency (ms)')
+    parser.add_argument('--page-latency', type=float, default=50, help='Mean fake page latency (ms)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Share of provider calls answered with 500')
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help='Share of provider calls answered with 429')
+    parser.add_argument('--real-limits', action='store_true', help='Keep the configured provider rate limits')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--verbose', action='store_true', help='Keep the app and provider client logs')
+    parser.add_argument('--output', help='Also write the results as JSON, e.g. to compare with a baseline')
+    args = parser.parse_args()
+
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    options = {
+        'llm_latency': args.llm_latency, 'search_latency': args.search_latency,
+        'email_latency': args.email_latency, 'page_latency': args.page_latency,
+        'error_rate': args.error_rate, 'throttle_rate': args.throttle_rate, 'seed': args.seed,
+    }
+    ready = multiprocessing.Event()
+    fakes = multiprocessing.Process(target=serve_fakes, args=(port, options, ready), daemon=True)
+    fakes.start()
+    if not ready.wait(30):
+        sys.exit('Fake providers did not start')
+
+    # create_app configures DEBUG logging only if nothing is configured yet
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.WARNING)
+
+    tmp = tempfile.mkdtemp(prefix='bench-e2e-')
+    configure_env(base_url, tmp, args.real_limits)
+    sys.path.insert(0, ROOT)
+
+    levels = [int(level) for level in args.levels.split(',') if level.strip()]
+    modes = ['agent', 'route'] if args.mode == 'both' else [args.mode]
+    tag = f"run{int(time.time())}"
+    rows = []
+    try:
+        app = None
+        if 'route' in modes:
+            from src import create_app
+            app = create_app()
+        # Warm imports, pools and worker processes outside the measurements
+        run_agent_level(base_url, 1, 1, f"{tag}-warmup")
+
+        print(f"{'mode':<6} {'conc':>5} {'reqs':>6} {'errors':>6} {'req/s':>9} "
+              f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'peak MB':>9}")
+        for mode in modes:
+            for level in levels:
+                requests = max(args.requests, level)
+                if mode == 'agent':
+                    row = run_agent_level(base_url, level, requests, tag)
+                else:
+                    row = run_route_level(app, base_url, level, requests, tag)
+                rows.append(row)
+                print(format_row(row), flush=True)
+    finally:
+        from src.research.runtime import runtime
+        runtime.stop()
+        fakes.terminate()
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'options': vars(args), 'results': rows}, f, indent=2)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""Compare HTML text extraction backends on saved pages.
+
+Usage:
+    python benchmarks/bench_extraction.py [PAGE_OR_DIR ...] [--repeat N]
+
+Pass saved .html files or directories of them (e.g. pages downloaded with
+``curl -o``). With no pages, a synthetic company page is used. Reports the
+time per page for each backend and whether its output matches the
+BeautifulSoup reference exactly.
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.research.extraction import BACKENDS, extract_text_bs4
+
+def synthetic_page(sections: int = 400) -> str:
+    body = []
+    for i in range(sections):
+        body.append(
+            f"<div class='section'><h2>Section {i}</h2>"
+            f"<p>Acme helps <b>teams</b> ship faster &amp; safer. Paragraph {i} "
+            f"<a href='/x{i}'>link</a>.</p><ul><li>Feature {i}a</li><li>Feature {i}b</li></ul>"
+            f"<script>var x{i} = {i};</script></div>"
+        )
+    return (
+        "<html><head><style>body {}</style></head><body><nav><p>Menu</p></nav>"
+        + ''.join(body)
+        + "<footer><p>Copyright</p></footer></body></html>"
+    )
+
+def load_pages(paths):
+    pages = {}
+    for path in paths:
+        files = glob.glob(os.path.join(path, '*.html')) if os.path.isdir(path) else [path]
+        for file in sorted(files):
+            with open(file, 'r', encoding='utf-8', errors='replace') as f:
+                pages[os.path.basename(file)] = f.read()
+    return pages or {'synthetic.html': synthetic_page()}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('paths', nargs='*')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    pages = load_pages(args.paths)
+    total_kb = sum(len(html) for html in pages.values()) / 1024
+    print(f"{len(pages)} pages, {total_kb:.0f} KiB total, {args.repeat} repeats\n")
+
+    reference = {name: extract_text_bs4(html) for name, html in pages.items()}
+    baseline = None
+    print(f"{'backend':<10}{'ms/page':>10}{'speedup':>10}{'identical':>12}")
+    for name, extract in BACKENDS.items():
+        try:
+            outputs = {page: extract(html) for page, html in pages.items()}
+        except ImportError as e:
+            print(f"{name:<10}  skipped ({e})")
+            continue
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            for html in pages.values():
+                extract(html)
+        per_page = (time.perf_counter() - start) * 1000 / (args.repeat * len(pages))
+        baseline = baseline or per_page
+        identical = sum(outputs[page] == reference[page] for page in pages)
+        print(f"{name:<10}{per_page:>10.2f}{baseline / per_page:>9.1f}x{identical:>8}/{len(pages)}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""Measure how long the web app takes to import, and fail if startup regresses.
+
+Usage:
+    python benchmarks/bench_import.py [--runs N] [--max-seconds S]
+
+Each run imports ``src.routes`` (what ``run.py`` and every dev reload load)
+in a fresh interpreter. Exits non-zero if the median import time exceeds
+``--max-seconds`` or if any heavy dependency that should load lazily on first
+use ends up in ``sys.modules``.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Only needed once a request actually calls an LLM, search or the reference parser
+LAZY_MODULES = ('litellm', 'openai', 'tavily', 'pydantic_ai', 'bs4')
+
+PROBE = f"""
+import json, sys, time
+sys.path.insert(0, {ROOT!r})
+start = time.perf_counter()
+import src.routes
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    "seconds": elapsed,
+    "loaded": [name for name in {LAZY_MODULES!r} if name in sys.modules],
+}}))
+"""
+
+def probe(env) -> dict:
+    output = subprocess.run(
+        [sys.executable, '-c', PROBE], env=env, cwd=ROOT,
+        capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5, help='Fresh interpreters to time')
+    parser.add_argument('--max-seconds', type=float, default=1.5, help='Allowed median import time')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Module-level caches open SQLite on import; keep them away from the real database
+        env = dict(os.environ, DATABASE_PATH=os.path.join(tmp, 'bench.sqlite'))
+        probe(env)  # Warm the bytecode cache so the first run is not an outlier
+        results = [probe(env) for _ in range(args.runs)]
+
+    times = [result['seconds'] for result in results]
+    loaded = sorted({name for result in results for name in result['loaded']})
+    median = statistics.median(times)
+    print(f"import src.routes: median {median * 1000:.0f} ms, "
+          f"min {min(times) * 1000:.0f} ms, max {max(times) * 1000:.0f} ms over {args.runs} runs")
+
+    failed = False
+    if loaded:
+        print(f"FAIL: imported eagerly: {', '.join(loaded)}")
+        failed = True
+    if median > args.max_seconds:
+        print(f"FAIL: median import time exceeds {args.max_seconds:.2f}s")
+        failed = True
+    if not failed:
+        print("OK")
+    sys.exit(1 if failed else 0)
+
+if __name__ == '__main__':
+    main()
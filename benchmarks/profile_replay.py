@@ -0,0 +1,105 @@
+"""Record one research run to a cassette, or profile replays of it with no network.
+
+Usage:
+    python benchmarks/profile_replay.py record CASSETTE --website URL --titles "CEO, CTO"
+    python benchmarks/profile_replay.py replay CASSETTE --website URL --titles "CEO, CTO"
+                                        [--repeat N] [--sort cumulative] [--limit 40]
+                                        [--stats out.prof]
+
+``record`` runs the pipeline against the real providers (API keys from the
+environment) and writes every Tavily response, LLM completion, raw page and
+FindyMail answer to CASSETTE. ``replay`` answers all of those from the
+cassette and runs the pipeline under cProfile, so the report shows CPU-side
+costs (HTML parsing, JSON, pydantic models, context packing) on real payloads.
+
+Both commands use a fresh temporary database. Replays also turn off the
+in-memory and LLM caches and parse HTML inline, so every repeat does the full
+work in the profiled thread.
+"""
+import argparse
+import asyncio
+import cProfile
+import os
+import pstats
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def configure_env(mode: str, cassette: str, tmp: str) -> None:
+    """Must run before anything under src is imported"""
+    os.environ.update({
+        'REPLAY_MODE': mode,
+        'REPLAY_PATH': cassette,
+        'DATABASE_PATH': os.path.join(tmp, 'profile.sqlite'),
+    })
+    if mode == 'replay':
+        os.environ.update({
+            'LLM_CACHE_ENABLED': 'false',
+            'SEARCH_CACHE_MAX_BYTES': '0',
+            'PAGE_CACHE_MAX_BYTES': '0',
+            'EMAIL_CACHE_TTL': '0',
+            'EMAIL_CACHE_MISS_TTL': '0',
+            'EXTRACTION_WORKERS': '0',
+        })
+
+async def research(website: str, titles: str, repeat: int) -> dict:
+    from src.research.agent import get_research_agent
+    from src.research.http import http_client
+
+    agent = get_research_agent()
+    result = {}
+    try:
+        for _ in range(repeat):
+            result = await agent.process_company(website, titles)
+    finally:
+        await http_client.close()
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('mode', choices=['record', 'replay'])
+    parser.add_argument('cassette', help='Cassette file, e.g. runs/acme.jsonl.gz')
+    parser.add_argument('--website', required=True)
+    parser.add_argument('--titles', required=True, help='Comma-separated titles')
+    parser.add_argument('--repeat', type=int, default=5, help='Replays to profile')
+    parser.add_argument('--sort', default='cumulative', help='pstats sort key')
+    parser.add_argument('--limit', type=int, default=40, help='Rows of the profile to print')
+    parser.add_argument('--stats', help='Also dump raw profile stats here (for snakeviz etc.)')
+    args = parser.parse_args()
+
+    if args.mode == 'replay' and not os.path.exists(args.cassette):
+        sys.exit(f"{args.cassette} not found; record it first")
+
+    tmp = tempfile.mkdtemp(prefix='profile-replay-')
+    configure_env(args.mode, os.path.abspath(args.cassette), tmp)
+    sys.path.insert(0, ROOT)
+
+    if args.mode == 'record':
+        started = time.perf_counter()
+        result = asyncio.run(research(args.website, args.titles, 1))
+        from src.research.replay import cassette
+        cassette.close()
+        print(f"Recorded {args.website} in {time.perf_counter() - started:.1f}s "
+              f"({len(result.get('people', []))} people) to {args.cassette}")
+        return
+
+    # Import outside the profile so module loading does not dominate it
+    import src.research.agent  # noqa: F401
+
+    profiler = cProfile.Profile()
+    started = time.perf_counter()
+    profiler.enable()
+    asyncio.run(research(args.website, args.titles, args.repeat))
+    profiler.disable()
+    elapsed = time.perf_counter() - started
+    print(f"{args.repeat} replays in {elapsed:.2f}s ({elapsed / args.repeat * 1000:.0f} ms each)\n")
+
+    stats = pstats.Stats(profiler)
+    stats.strip_dirs().sort_stats(args.sort).print_stats(args.limit)
+    if args.stats:
+        stats.dump_stats(args.stats)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,39 @@
+import sys
+import os
+import argparse
+import asyncio
+import json
+
+# Add the project root directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from src.research.agent import get_research_agent
+from src.research.bulk import BulkRunner, Checkpoint, detect_format, read_rows
+from src.research.http import http_client
+
+async def main(args):
+    checkpoint = Checkpoint(args.checkpoint or f"{args.output}.checkpoint")
+    runner = BulkRunner(get_research_agent(), concurrency=args.concurrency, checkpoint=checkpoint)
+    fmt = args.format or detect_format(args.input)
+    output_dir = os.path.dirname(args.output)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    try:
+        # Append so a resumed batch keeps the results already written
+        with open(args.input, 'r', newline='') as source, open(args.output, 'a') as output:
+            async for record in runner.run(read_rows(source, fmt)):
+                output.write(json.dumps(record) + '\n')
+                output.flush()
+                print(f"{'done' if record['success'] else 'failed'}: {record['website']}")
+    finally:
+        checkpoint.close()
+        await http_client.close()
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Research a list of companies from a CSV or JSONL file')
+    parser.add_argument('input', help='CSV with website,titles columns, or JSONL with website/titles keys')
+    parser.add_argument('-o', '--output', default=os.path.join('data', 'results.jsonl'), help='JSONL file results are appended to')
+    parser.add_argument('--format', choices=['csv', 'jsonl'], help='Input format (default: from file extension)')
+    parser.add_argument('--checkpoint', help='Checkpoint file (default: <output>.checkpoint)')
+    parser.add_argument('--concurrency', type=int, help='Companies researched at once')
+    asyncio.run(main(parser.parse_args()))
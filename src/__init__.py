@@ -27,6 +27,13 @@ def create_app(test_config=None):
     from . import db
     db.init_app(app)
 
+    from .research import http, runtime
+    http.init_app(app)
+    runtime.init_app(app)
+
+    from . import jobs
+    jobs.init_app(app)
+
     from .routes import main  # Note the relative import
     app.register_blueprint(main)
 
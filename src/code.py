@@ -3,16 +3,21 @@ from pydantic_ai.models.openai import OpenAIModel
 from dotenv import load_dotenv
 from IPython.display import display, Markdown  # Capital "I"
 from pydantic import BaseModel
-from dataclasses import dataclass, field
 from typing import List
-from litellm import completion
-from tavily import TavilyClient
 import json
 import litellm
 import os
-import nest_asyncio
+import sys
 import logging
 
+# Add the project root directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.research.config import Config
+from src.research.dependencies import ResearchDeps
+from src.research.llm import llm_client
+from src.research.search_client import search_client
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -27,21 +32,12 @@ logger = logging.getLogger(__name__)
 # MAKE SURE to set the TAVILY_API_KEY environment variable
 # export TAVILY_API_KEY=<your_tavily_api_key>
 
-# Enable async support in Jupyter
-nest_asyncio.apply()
-
 # Load environment variables
 load_dotenv()
 
-# Initialize TavilyClient
-tavily_client = TavilyClient(api_key=os.getenv('TAVILY_API_KEY'))
-
 # Set LiteLLM verbosity
 litellm.set_verbose = False
 
-# Define maximum web search loops
-MAX_WEB_SEARCH_LOOPS = 2
-
 # Query writer system prompt
 query_writer_system_prompt = """
 Generate 7-10 specific search queries to thoroughly research {company_website}.
@@ -79,6 +75,16 @@ In both cases:
 - DO NOT add a References or Works Cited section.
 """
 
+# Reducer system prompt
+reducer_system_prompt = """You are given several partial summaries of web research about one company.
+Merge them into a single high-quality summary:
+1. Combine overlapping points and remove repetition
+2. Keep every distinct fact, figure, date and example
+3. Group related information so the summary reads as one coherent text
+4. DO NOT mention that the input was split into partial summaries
+5. DO NOT add a preamble or a References section. Just directly output the summary.
+"""
+
 def format_sources(sources):
     """
     Formats a list of source dictionaries into a structured text for LLM input.
@@ -99,31 +105,22 @@ def format_sources(sources):
         )
     return formatted_text.strip()
 
-@dataclass
-class ResearchDeps:
-    company_website: str = None
-    prompt_template: str = None
-    search_topics: List[str] = field(default_factory=list)
-    current_topic_index: int = 0
-    search_query: str = None
-    current_summary: str = None
-    final_summary: str = None
-    sources: List[str] = field(default_factory=list)
-    latest_web_search_result: str = None
-    research_loop_count: int = 0
-
-async def generate_search_query(ctx: RunContext[ResearchDeps]) -> str:
-    if not ctx.deps.search_topics:
-        response = completion(
-            model="gpt-4o-mini",
+async def ensure_search_topics(deps: ResearchDeps) -> None:
+    """Have the LLM write the search queries, once per research run"""
+    if not deps.search_topics:
+        content = await llm_client.complete(
             messages=[{
-                "content": query_writer_system_prompt.format(company_website=ctx.deps.company_website),
+                "content": query_writer_system_prompt.format(company_website=deps.company_website),
                 "role": "system"
             }],
-            response_format={"type": "json_object"}
+            response_format={"type": "json_object"},
+            prompt_name="query_writer"
         )
-        data = json.loads(response.choices[0].message.content)
-        ctx.deps.search_topics = data["queries"]
+        data = json.loads(content)
+        deps.search_topics = data["queries"]
+
+async def generate_search_query(ctx: RunContext[ResearchDeps]) -> str:
+    await ensure_search_topics(ctx.deps)
     
     if ctx.deps.current_topic_index < len(ctx.deps.search_topics):
         ctx.deps.search_query = ctx.deps.search_topics[ctx.deps.current_topic_index]
@@ -136,15 +133,20 @@ async def perform_web_search(ctx: RunContext[ResearchDeps]) -> str:
     print("==== CALLING perform_web_search... ====")
     print(f"Search query: {ctx.deps.search_query}")
 
-    search_results = tavily_client.search(ctx.deps.search_query, include_raw_content=False, max_results=4)
-    search_string = format_sources(search_results["results"])
-    ctx.deps.sources.extend(search_results["results"])
-    ctx.deps.latest_web_search_result = search_string
+    search_results = await search_client.search(ctx.deps.search_query, include_raw_content=False, max_results=4)
+    fresh_results = ctx.deps.novelty.observe(search_results, ctx.deps.sources, ctx.deps.current_summary)
+    ctx.deps.sources.extend(fresh_results)
+    ctx.deps.latest_web_search_result = format_sources(fresh_results)
     ctx.deps.research_loop_count += 1
+    if not fresh_results or not ctx.deps.novelty.is_novel():
+        # Nothing worth an LLM call; let the controller decide whether to go on
+        return "continue_or_stop_research"
     return "summarize_sources"
 
 async def continue_or_stop_research(ctx: RunContext[ResearchDeps]) -> str:
-    if ctx.deps.research_loop_count >= MAX_WEB_SEARCH_LOOPS:
+    reason = ctx.deps.novelty.stop_reason()
+    if reason:
+        logger.info(f"Stopping research on {ctx.deps.company_website}: {reason}")
         return "finalize_summary"
     if ctx.deps.current_topic_index < len(ctx.deps.search_topics):
         return "generate_search_query"
@@ -165,18 +167,73 @@ async def summarize_sources(ctx: RunContext[ResearchDeps]) -> str:
     if current_summary:
         user_prompt = f"Current summary: {current_summary}\nAdd new findings from '{current_query}':\n{most_recent_web_research}"
 
-    response = completion(
-        model="gpt-4o-mini",
+    ctx.deps.current_summary = await llm_client.complete(
         messages=[
             {"content": summarizer_system_prompt, "role": "system"},
             {"content": user_prompt, "role": "user"}
         ],
         max_tokens=1000,
+        prompt_name="summarizer",
     )
-    ctx.deps.current_summary = response.choices[0].message.content
+    ctx.deps.novelty.spend(summarizer_system_prompt, user_prompt, ctx.deps.current_summary)
     return "continue_or_stop_research"
 
 
+async def summarize_chunk(company_website: str, sources: List[dict]) -> str:
+    """Map step: summarize one chunk of search results on its own"""
+    return await llm_client.complete(
+        messages=[
+            {"content": summarizer_system_prompt, "role": "system"},
+            {"content": f"Create a summary about {company_website} from these results:\n{format_sources(sources)}", "role": "user"}
+        ],
+        max_tokens=1000,
+        prompt_name="map_summarizer",
+    )
+
+async def reduce_summaries(company_website: str, summaries: List[str]) -> str:
+    """Reduce step: merge the chunk summaries in a single call"""
+    if len(summaries) <= 1:
+        return summaries[0] if summaries else ""
+    partials = "\n\n".join(f"Partial summary {i}:\n{summary}" for i, summary in enumerate(summaries, start=1))
+    return await llm_client.complete(
+        messages=[
+            {"content": reducer_system_prompt, "role": "system"},
+            {"content": f"Company: {company_website}\n\n{partials}", "role": "user"}
+        ],
+        max_tokens=2000,
+        prompt_name="reduce_summarizer",
+    )
+
+async def map_reduce_research(deps: ResearchDeps) -> None:
+    """Search every topic at once, summarize source chunks in parallel, then merge
+
+    Searches and chunk summaries overlap, so wall-clock time grows with the
+    slowest call rather than with the number of topics.
+    """
+    await ensure_search_topics(deps)
+    results = await search_client.search_many(deps.search_topics, include_raw_content=False, max_results=4)
+    seen_urls = {source['url'] for source in deps.sources}
+    for batch in results:
+        for source in batch:
+            if source['url'] not in seen_urls:
+                seen_urls.add(source['url'])
+                deps.sources.append(source)
+    deps.current_topic_index = len(deps.search_topics)
+    deps.research_loop_count += 1
+
+    await deps.process_sources_concurrently(
+        lambda chunk: summarize_chunk(deps.company_website, chunk),
+        chunk_size=Config.RESEARCH_CHUNK_SIZE,
+        concurrency=Config.RESEARCH_MAP_CONCURRENCY
+    )
+    deps.current_summary = await reduce_summaries(deps.company_website, deps.parallel_summaries)
+
+async def research_all_topics(ctx: RunContext[ResearchDeps]) -> str:
+    """Research every topic concurrently and build the summary in one pass"""
+    print("==== CALLING research_all_topics... ====")
+    await map_reduce_research(ctx.deps)
+    return "finalize_summary"
+
 async def finalize_summary(ctx: RunContext[ResearchDeps]) -> str:
     """Finalize the summary"""
     print("==== CALLING finalize_summary... ====")
@@ -200,18 +257,32 @@ default_system_prompt = """You are a researcher. You need to use your tools and
 You must STOP your research if you have done {max_loop} iterations.
 """
 
-research_agent = Agent(
-    model, 
-    system_prompt=default_system_prompt.format(max_loop=MAX_WEB_SEARCH_LOOPS),
-    deps_type=ResearchDeps, 
-    tools=[
-        Tool(generate_search_query), 
-        Tool(perform_web_search),
-        Tool(summarize_sources),
-        Tool(finalize_summary), 
-        Tool(continue_or_stop_research)
-    ]
-)
+map_reduce_system_prompt = """You are a researcher. Call research_all_topics once, then call finalize_summary.
+"""
+
+if Config.RESEARCH_MODE == "map_reduce":
+    research_agent = Agent(
+        model,
+        system_prompt=map_reduce_system_prompt,
+        deps_type=ResearchDeps,
+        tools=[
+            Tool(research_all_topics),
+            Tool(finalize_summary)
+        ]
+    )
+else:
+    research_agent = Agent(
+        model, 
+        system_prompt=default_system_prompt.format(max_loop=Config.RESEARCH_MAX_LOOPS),
+        deps_type=ResearchDeps, 
+        tools=[
+            Tool(generate_search_query), 
+            Tool(perform_web_search),
+            Tool(summarize_sources),
+            Tool(finalize_summary), 
+            Tool(continue_or_stop_research)
+        ]
+    )
 
 website = "https://linktr.ee/"
 prompt_template = """
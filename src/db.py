@@ -1,8 +1,10 @@
 
 import sqlite3
 from flask import g
+from .research.config import Config
+from .research.storage import init_schema
 
-DATABASE = 'sdr_researcher.sqlite'  # Adjust if needed
+DATABASE = Config.DATABASE_PATH
 
 def get_db():
     db = getattr(g, '_database', None)
@@ -13,9 +15,7 @@ def get_db():
 def init_app(app):
     with app.app_context():
         db = get_db()
-        # Initialize database tables here if needed
-        # db.execute("CREATE TABLE IF NOT EXISTS ...")
-        db.commit()
+        init_schema(db)
 
     app.teardown_appcontext(close_db)
 
@@ -0,0 +1,257 @@
+import atexit
+import concurrent.futures
+import json
+import logging
+import os
+import queue
+import socket
+import threading
+import time
+import uuid
+from typing import Dict, List, Optional
+
+from .research.agent import get_research_agent
+from .research.config import Config
+from .research.runtime import AsyncRuntime, runtime as shared_runtime
+from .research.storage import connect
+
+logger = logging.getLogger(__name__)
+
+QUEUED = 'queued'
+RUNNING = 'running'
+SUCCEEDED = 'succeeded'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+
+FINISHED_STATUSES = (SUCCEEDED, FAILED, CANCELLED)
+
+class JobStore:
+    """Research job state and results in the shared SQLite database"""
+
+    def __init__(self, path: Optional[str] = None):
+        self._conn = connect(path)
+        self._lock = threading.Lock()
+
+    def create(self, website: str, titles: str) -> Dict:
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (id, website, titles, status, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, website, titles, QUEUED, now, now)
+            )
+            self._conn.commit()
+        return self.get(job_id)
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, website, titles, status, result, error, created_at, updated_at "
+                "FROM jobs WHERE id = ?",
+                (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        job = dict(zip(('id', 'website', 'titles', 'status', 'result', 'error', 'created_at', 'updated_at'), row))
+        job['result'] = json.loads(job['result']) if job['result'] else None
+        return job
+
+    def set_status(self, job_id: str, status: str, result: Optional[Dict] = None,
+                   error: Optional[str] = None, only_from: Optional[tuple] = None) -> bool:
+        """Update a job's status; with ``only_from``, only if it is currently in one of those states"""
+        query = "UPDATE jobs SET status = ?, result = ?, error = ?, updated_at = ? WHERE id = ?"
+        params = [status, json.dumps(result) if result is not None else None, error, time.time(), job_id]
+        if only_from:
+            query += f" AND status IN ({', '.join('?' for _ in only_from)})"
+            params.extend(only_from)
+        with self._lock:
+            updated = self._conn.execute(query, params).rowcount
+            self._conn.commit()
+        return updated > 0
+
+    def claim(self, job_id: str, worker_id: str) -> bool:
+        """Mark a queued job as running in this worker; False if it is no longer queued"""
+        now = time.time()
+        with self._lock:
+            updated = self._conn.execute(
+                "UPDATE jobs SET status = ?, worker_id = ?, heartbeat_at = ?, updated_at = ? "
+                "WHERE id = ? AND status = ?",
+                (RUNNING, worker_id, now, now, job_id, QUEUED)
+            ).rowcount
+            self._conn.commit()
+        return updated > 0
+
+    def heartbeat(self, worker_id: str) -> None:
+        """Show that this worker's running jobs are still alive"""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET heartbeat_at = ? WHERE worker_id = ? AND status = ?",
+                (time.time(), worker_id, RUNNING)
+            )
+            self._conn.commit()
+
+    def requeue_stale(self, stale_after: float) -> List[str]:
+        """Requeue running jobs whose owner stopped heartbeating and return their ids"""
+        now = time.time()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id FROM jobs WHERE status = ? AND (heartbeat_at IS NULL OR heartbeat_at < ?) "
+                "ORDER BY created_at",
+                (RUNNING, now - stale_after)
+            ).fetchall()
+            requeued = []
+            for (job_id,) in rows:
+                # Re-check staleness so a job that just heartbeated is left alone
+                if self._conn.execute(
+                    "UPDATE jobs SET status = ?, worker_id = NULL, updated_at = ? "
+                    "WHERE id = ? AND status = ? AND (heartbeat_at IS NULL OR heartbeat_at < ?)",
+                    (QUEUED, now, job_id, RUNNING, now - stale_after)
+                ).rowcount:
+                    requeued.append(job_id)
+            self._conn.commit()
+        for job_id in requeued:
+            logger.warning(f"Requeued research job {job_id}: its worker stopped heartbeating")
+        return requeued
+
+    def recover(self, stale_after: float) -> List[str]:
+        """Requeue jobs whose worker died and return every queued job id, oldest first
+
+        Running jobs with a recent heartbeat belong to a live process and are left alone.
+        """
+        self.requeue_stale(stale_after)
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id FROM jobs WHERE status = ? ORDER BY created_at",
+                (QUEUED,)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+class JobQueue:
+    """Worker pool running research jobs off the request threads
+
+    Jobs run on the shared async runtime, so they use the same connection pool,
+    caches and limits as web requests; the worker threads only cap how many
+    jobs are in progress at once. Running jobs carry this process's worker id
+    and a heartbeat, so several processes can share the database without
+    requeueing each other's live jobs.
+    """
+
+    def __init__(self, store: JobStore, workers: Optional[int] = None,
+                 runtime: AsyncRuntime = shared_runtime,
+                 heartbeat_interval: Optional[float] = None, stale_after: Optional[float] = None):
+        self.store = store
+        self.workers = workers or Config.JOB_WORKERS
+        self.runtime = runtime
+        self.heartbeat_interval = heartbeat_interval or Config.JOB_HEARTBEAT_INTERVAL
+        self.stale_after = stale_after or Config.JOB_STALE_AFTER
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._stopping = threading.Event()
+        self._queue: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._running: Dict[str, concurrent.futures.Future] = {}
+        self._cancelled = set()
+        self._threads = []
+        self._lock = threading.Lock()
+        self._started = False
+
+    def start(self) -> None:
+        """Start the workers and requeue unfinished jobs; safe to call repeatedly"""
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+            for job_id in self.store.recover(self.stale_after):
+                self._queue.put(job_id)
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._work, name=f'research-job-{i}', daemon=True)
+                thread.start()
+                self._threads.append(thread)
+            threading.Thread(target=self._heartbeat, name='research-job-heartbeat', daemon=True).start()
+
+    def submit(self, website: str, titles: str) -> Dict:
+        job = self.store.create(website, titles)
+        self._queue.put(job['id'])
+        return job
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a queued or running job; returns False if it already finished"""
+        with self._lock:
+            if self.store.set_status(job_id, CANCELLED, only_from=(QUEUED,)):
+                return True
+            running = self._running.get(job_id)
+            if running is None:
+                return False
+            self._cancelled.add(job_id)
+            # Fails if the job finished in the meantime; its result stands
+            if not running.cancel():
+                self._cancelled.discard(job_id)
+                return False
+        return True
+
+    def shutdown(self, timeout: float = 5) -> None:
+        self._stopping.set()
+        # Workers block on their job's result; release them before joining. The
+        # jobs stay running in the store and are requeued once their heartbeat is stale.
+        with self._lock:
+            running = list(self._running.values())
+        for future in running:
+            future.cancel()
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def _heartbeat(self) -> None:
+        """Keep this process's jobs alive and pick up jobs abandoned by dead workers"""
+        while not self._stopping.wait(self.heartbeat_interval):
+            try:
+                self.store.heartbeat(self.worker_id)
+                for job_id in self.store.requeue_stale(self.stale_after):
+                    self._queue.put(job_id)
+            except Exception as e:
+                logger.error(f"Job heartbeat failed: {str(e)}")
+
+    def _work(self) -> None:
+        while True:
+            job_id = self._queue.get()
+            if job_id is None:
+                break
+            self._run_job(job_id)
+
+    def _run_job(self, job_id: str) -> None:
+        with self._lock:
+            # Skip jobs cancelled while they were waiting in the queue
+            if not self.store.claim(job_id, self.worker_id):
+                return
+            job = self.store.get(job_id)
+            future = self.runtime.submit(get_research_agent().process_company(job['website'], job['titles']))
+            self._running[job_id] = future
+        try:
+            result = future.result()
+            self.store.set_status(job_id, SUCCEEDED, result=result)
+        except concurrent.futures.CancelledError:
+            # Otherwise the runtime is shutting down: leave it running so it is requeued once its heartbeat goes stale
+            if job_id in self._cancelled:
+                self.store.set_status(job_id, CANCELLED)
+        except Exception as e:
+            logger.error(f"Research job {job_id} failed: {str(e)}")
+            self.store.set_status(job_id, FAILED, error=str(e))
+        finally:
+            with self._lock:
+                self._running.pop(job_id, None)
+                self._cancelled.discard(job_id)
+
+def get_job_queue(app) -> JobQueue:
+    return app.extensions['job_queue']
+
+def init_app(app):
+    job_queue = JobQueue(JobStore())
+    app.extensions['job_queue'] = job_queue
+
+    # Start workers on the first request rather than at import, so the debug
+    # reloader's parent process never picks up jobs
+    @app.before_request
+    def start_job_workers():
+        job_queue.start()
+
+    atexit.register(job_queue.shutdown)
@@ -1,42 +1,41 @@
-from pydantic_ai import Agent, RunContext, Tool
-from pydantic_ai.models.openai import OpenAIModel
-from typing import List, Dict
-from litellm import completion
-from tavily import TavilyClient
+from typing import AsyncIterator, List, Dict, Optional, Tuple
+import asyncio
 import json
 import logging
-import os
+import threading
 from .web_scraper import WebScraper
+from .search_client import search_client
+from .llm import llm_client
+from .concurrency import cancel_quietly
+from .context import ContextBuilder
+from .metrics import span, timed
 from .config import Config
 from .models import CompanyInfo, PersonInfo, Challenge  # Add Challenge to imports
 from .email_finder import EmailFinder
 from .prompts import ResearchPrompts  # Add this import
+from .solutions import SolutionCatalog
 
 logger = logging.getLogger(__name__)
 
+# Terms each prompt cares about, used to rank context passages
+DESCRIPTION_FOCUS = "company product products service services platform customers clients market offers helps provides solution"
+CHALLENGES_FOCUS = (
+    "challenge challenges growth funding raised employees hiring news launch expansion competition "
+    "technology stack infrastructure cloud data scale customers market revenue"
+)
+
 class CompanyResearchAgent:
     def __init__(self):
         self.web_scraper = WebScraper()
-        self.tavily_client = TavilyClient(api_key=Config.get_api_key('TAVILY_API_KEY'))
+        self.search_client = search_client
+        self.llm = llm_client
         self.email_finder = EmailFinder()
-        self.solutions = self.load_solutions()
-
-    def load_solutions(self):
-        """Load software solutions from JSON file"""
-        try:
-            with open("solutions.json", "r") as f:
-                return json.load(f)
-        except FileNotFoundError:
-            logger.error("solutions.json not found")
-            return {}
-        except json.JSONDecodeError:
-            logger.error("Invalid JSON in solutions.json")
-            return {}
+        self.solutions = SolutionCatalog()
 
-    async def get_company_description(self, website: str) -> CompanyInfo:
-        """Get basic company description and analyze specific challenges"""
-        # Get basic description
-        content = await self.web_scraper.get_page_content(website)
+    async def _gather_company_context(self, website: str) -> Dict:
+        """Scrape the website and run the company searches"""
+        with span('website_scrape'):
+            content = await self.web_scraper.get_page_content(website)
         
         # Gather comprehensive company context
         company_searches = [
@@ -46,34 +45,46 @@ class CompanyResearchAgent:
             f"{website} company technology stack infrastructure"
         ]
         
-        all_results = []
-        for query in company_searches:
-            results = self.tavily_client.search(query, max_results=2)
-            all_results.extend(results["results"])
+        # Run all searches at once; a slow or failed query just contributes nothing
+        search_results = await self.search_client.search_many(company_searches, max_results=2)
+        all_results = [result for results in search_results for result in results]
         
         combined_info = {
             "website_content": content or "",
             "search_results": [r["content"] for r in all_results],
             "domain": website
         }
-        
-        # Get company description
-        description_response = completion(
-            model="gpt-4o-mini",
+        return combined_info
+
+    def _pack_company_context(self, combined_info: Dict, budget: int, focus: str) -> Dict:
+        """Trim the gathered context to the passages that matter for one prompt"""
+        passages = ContextBuilder(budget, focus).build([
+            ("website", [combined_info["website_content"]]),
+            ("search", combined_info["search_results"])
+        ])
+        return {
+            "website_content": " ".join(p.text for p in passages if p.source == "website"),
+            "search_results": [p.text for p in passages if p.source == "search"],
+            "domain": combined_info["domain"]
+        }
+
+    async def _describe_company(self, combined_info: Dict) -> str:
+        """Get basic company description"""
+        context = self._pack_company_context(combined_info, Config.CONTEXT_TOKENS_DESCRIPTION, DESCRIPTION_FOCUS)
+        return await self.llm.complete(
             messages=[{
                 "role": "system",
                 "content": ResearchPrompts.COMPANY_DESCRIPTION
             }, {
                 "role": "user",
-                "content": json.dumps(combined_info)
-            }]
+                "content": json.dumps(context)
+            }],
+            prompt_name="company_description"
         )
-        
-        description = description_response.choices[0].message.content
 
-        # Analyze company-specific challenges with full context
-        challenges_response = completion(
-            model="gpt-4o-mini",
+    async def _analyze_challenges(self, description: str, combined_info: Dict) -> List[Challenge]:
+        """Analyze company-specific challenges with full context"""
+        challenges_content = await self.llm.complete(
             messages=[{
                 "role": "system",
                 "content": ResearchPrompts.CHALLENGES_ANALYSIS
@@ -81,14 +92,17 @@ class CompanyResearchAgent:
                 "role": "user",
                 "content": json.dumps({
                     "company_description": description,
-                    "context": combined_info
+                    "context": self._pack_company_context(
+                        combined_info, Config.CONTEXT_TOKENS_CHALLENGES, CHALLENGES_FOCUS
+                    )
                 })
             }],
             response_format={"type": "json_object"},
-            temperature=0.7  # Add temperature setting
+            temperature=0.7,  # Add temperature setting
+            prompt_name="challenges_analysis"
         )
         
-        challenges_data = json.loads(challenges_response.choices[0].message.content)
+        challenges_data = json.loads(challenges_content)
         logger.debug(f"Raw JSON response: {challenges_data}")  # Log the raw JSON
 
         challenges = []
@@ -97,7 +111,7 @@ class CompanyResearchAgent:
             if solution_type == "N/A":
                 logger.warning(f"Missing software_solution_category for challenge: {c.get('description', 'No description')}")
             logger.debug(f"Solution type: {solution_type}")  # Log the solution type
-            solution = self.solutions.get(solution_type, {})  # Get solution details from the loaded solutions
+            solution = self.solutions.get(solution_type)  # Exact, alias or closest catalog match
             
             challenges.append(Challenge(
                 category=c.get("category", "N/A"),
@@ -119,7 +133,13 @@ class CompanyResearchAgent:
                 solution_impact_metrics=solution.get("impact", {}).get("metrics", []),
                 sources=c.get("sources", [])
             ))
-        
+        return challenges
+
+    async def get_company_description(self, website: str) -> CompanyInfo:
+        """Get basic company description and analyze specific challenges"""
+        combined_info = await self._gather_company_context(website)
+        description = await self._describe_company(combined_info)
+        challenges = await self._analyze_challenges(description, combined_info)
         return CompanyInfo(
             website=website,
             description=description,
@@ -136,26 +156,91 @@ class CompanyResearchAgent:
 
     async def process_company(self, website: str, titles_input: str) -> Dict:
         """Main method to process company and find people by titles"""
-        # Get company info
-        company_info = await self.get_company_description(website)
-        
-        # Parse and process titles
+        result = {}
+        async for event, data in self.process_company_stream(website, titles_input):
+            if event == "done":
+                result = data
+        return result
+
+    async def process_company_stream(self, website: str, titles_input: str) -> AsyncIterator[Tuple[str, Dict]]:
+        """Research the company and its people, yielding (event, data) pairs as results arrive
+
+        Events are "progress", "description", "challenge" and "person", followed
+        by a final "done" carrying the same payload as process_company. The
+        company and people stages run concurrently.
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        # Person lookups, cancelled with the stream so a disconnected client stops the work
+        people_futures: List[asyncio.Future] = []
         titles = self.parse_titles(titles_input)
-        people = await self.find_people_by_titles(website, titles)
-        
-        # Return combined results
-        return {
+        company_domain = website.split("//")[-1].split("/")[0]
+
+        def progress(stage: str, message: str) -> Tuple[str, Dict]:
+            return "progress", {"stage": stage, "message": message}
+
+        async def company_stage() -> CompanyInfo:
+            await queue.put(progress("company", "Reading website and searching for company context"))
+            combined_info = await self._gather_company_context(website)
+            await queue.put(progress("company", "Writing company description"))
+            description = await self._describe_company(combined_info)
+            await queue.put(("description", {"website": website, "description": description}))
+            await queue.put(progress("challenges", "Analyzing company challenges"))
+            challenges = await self._analyze_challenges(description, combined_info)
+            for index, challenge in enumerate(challenges):
+                await queue.put(("challenge", {"index": index, **challenge.dict()}))
+            return CompanyInfo(website=website, description=description, challenges=challenges)
+
+        async def people_stage() -> List[PersonInfo]:
+            await queue.put(progress("people", f"Looking up people for {len(titles)} titles"))
+            tasks = self._start_people_tasks(company_domain, titles, people_futures)
+            seen_urls = set()
+            for next_done in asyncio.as_completed(tasks):
+                try:
+                    person = await next_done
+                except Exception:
+                    continue  # Logged when collecting below
+                if person and person.linkedin_url not in seen_urls:
+                    seen_urls.add(person.linkedin_url)
+                    await queue.put(("person", person.dict()))
+            outcomes = await asyncio.gather(*tasks, return_exceptions=True)
+            return self._collect_people(titles, outcomes)
+
+        company_task = asyncio.ensure_future(timed('company', company_stage()))
+        people_task = asyncio.ensure_future(timed('people', people_stage()))
+        stages = asyncio.gather(company_task, people_task)
+        try:
+            while True:
+                getter = asyncio.ensure_future(queue.get())
+                await asyncio.wait({getter, stages}, return_when=asyncio.FIRST_COMPLETED)
+                if getter.done():
+                    yield getter.result()
+                    continue
+                getter.cancel()
+                break
+            while not queue.empty():
+                yield queue.get_nowait()
+            company_info, people = stages.result()
+        finally:
+            # Also runs on aclose() when the SSE client disconnects
+            cancel_quietly(stages)
+            for future in people_futures:
+                cancel_quietly(future)
+
+        yield "done", {
             "company": company_info.dict(),
             "people": [person.dict() for person in people]
         }
 
     async def _extract_person_info(self, linkedin_url: str) -> PersonInfo:
-        content = await self.web_scraper.get_page_content(linkedin_url)
+        with span('linkedin_scrape'):
+            content = await self.web_scraper.get_page_content(linkedin_url)
         if not content:
             return None
+        # The name sits near the top of the profile; ranking by position keeps it
+        passages = ContextBuilder(Config.CONTEXT_TOKENS_PERSON).build([("profile", [content])])
+        content = " ".join(p.text for p in passages)
             
-        response = completion(
-            model="gpt-4o-mini",
+        json_content = await self.llm.complete(
             messages=[{
                 "role": "system",
                 "content": ResearchPrompts.PERSON_EXTRACTOR
@@ -163,10 +248,10 @@ class CompanyResearchAgent:
                 "role": "user",
                 "content": content
             }],
-            response_format={"type": "json_object"}
+            response_format={"type": "json_object"},
+            prompt_name="person_extractor"
         )
         
-        json_content = response.choices[0].message.content
         logger.debug(f"JSON content: {json_content}")  # Log the JSON content
         
         name_data = json.loads(json_content)
@@ -181,45 +266,103 @@ class CompanyResearchAgent:
             linkedin_url=linkedin_url
         )
 
-    async def find_people_by_titles(self, website: str, titles: List[str]) -> List[PersonInfo]:
-        """Find people by their titles at the company"""
-        company_domain = website.split("//")[-1].split("/")[0]
-        results = []
+    async def _find_linkedin_url(self, company_domain: str, title: str) -> Optional[str]:
+        """Search for a LinkedIn profile matching the title at the company"""
+        search_results = await self.search_client.search(
+            f"{company_domain} {title} linkedin",
+            max_results=2
+        )
         
-        for title in titles:
-            # Search for person with this title
-            search_results = self.tavily_client.search(
-                f"{company_domain} {title} linkedin",
-                max_results=2
+        # Extract LinkedIn URLs
+        linkedin_urls = [
+            result['url'] for result in search_results
+            if 'linkedin.com/in/' in result['url']
+        ]
+        return linkedin_urls[0] if linkedin_urls else None
+
+    async def _resolve_person(self, linkedin_url: str, company_domain: str) -> Optional[PersonInfo]:
+        """Get person details from a LinkedIn URL and look up their email"""
+        person_info = await self._extract_person_info(linkedin_url)
+        if person_info:
+            person_info.email = await self.email_finder.find_email(
+                person_info.first_name,
+                person_info.last_name,
+                company_domain,
+                linkedin_url
             )
-            
-            if not search_results['results']:
-                continue
-                
-            # Extract LinkedIn URLs
-            linkedin_urls = [
-                result['url'] for result in search_results['results']
-                if 'linkedin.com/in/' in result['url']
-            ]
-            
-            if linkedin_urls:
-                # Get person details from LinkedIn URL
-                person_info = await self._extract_person_info(linkedin_urls[0])
-                if person_info:
-                    # Find email
-                    email = await self.email_finder.find_email(
-                        person_info.first_name,
-                        person_info.last_name,
-                        company_domain
+        return person_info
+
+    def _start_people_tasks(self, company_domain: str, titles: List[str],
+                            started: List[asyncio.Future]) -> List[asyncio.Future]:
+        """Start one bounded lookup task per title
+
+        Every future created, including lookups shared between titles, is
+        added to ``started`` so the caller can cancel them all.
+        """
+        semaphore = asyncio.Semaphore(Config.PEOPLE_MAX_CONCURRENCY)
+        person_tasks: Dict[str, asyncio.Future] = {}
+
+        async def find_person(title: str) -> Optional[PersonInfo]:
+            async with semaphore:
+                linkedin_url = await self._find_linkedin_url(company_domain, title)
+                if not linkedin_url:
+                    return None
+                # Titles that resolve to the same profile share a single lookup
+                if linkedin_url not in person_tasks:
+                    person_tasks[linkedin_url] = asyncio.ensure_future(
+                        self._resolve_person(linkedin_url, company_domain)
                     )
-                    person_info.email = email
-                    results.append(person_info)
-        
+                    started.append(person_tasks[linkedin_url])
+                # Shielded so one cancelled title does not cancel the lookup for the others
+                return await asyncio.shield(person_tasks[linkedin_url])
+
+        tasks = [asyncio.ensure_future(find_person(title)) for title in titles]
+        started.extend(tasks)
+        return tasks
+
+    def _collect_people(self, titles: List[str], people: List) -> List[PersonInfo]:
+        """Keep the original title order, listing each person once"""
+        results = []
+        seen_urls = set()
+        for title, person in zip(titles, people):
+            if isinstance(person, Exception):
+                logger.error(f"Error finding person for title '{title}': {str(person)}")
+                continue
+            if person and person.linkedin_url not in seen_urls:
+                seen_urls.add(person.linkedin_url)
+                results.append(person)
         return results
 
-# Initialize single research agent instance
-try:
-    research_agent = CompanyResearchAgent()
-except Exception as e:
-    logger.error(f"Error initializing research agent: {str(e)}")
-    raise
\ No newline at end of file
+    async def find_people_by_titles(self, website: str, titles: List[str]) -> List[PersonInfo]:
+        """Find people by their titles at the company, one concurrent task per title"""
+        company_domain = website.split("//")[-1].split("/")[0]
+        started: List[asyncio.Future] = []
+        try:
+            tasks = self._start_people_tasks(company_domain, titles, started)
+            people = await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            for future in started:
+                future.cancel()
+        return self._collect_people(titles, people)
+
+_research_agent: Optional[CompanyResearchAgent] = None
+_research_agent_lock = threading.Lock()
+
+def get_research_agent() -> CompanyResearchAgent:
+    """Return the shared research agent, building it on first use"""
+    global _research_agent
+    if _research_agent is None:
+        with _research_agent_lock:
+            if _research_agent is None:
+                try:
+                    _research_agent = CompanyResearchAgent()
+                except Exception as e:
+                    logger.error(f"Error initializing research agent: {str(e)}")
+                    raise
+    return _research_agent
+
+def __getattr__(name: str):
+    # Keeps `from .agent import research_agent` working without building the agent at import
+    if name == 'research_agent':
+        return get_research_agent()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,168 @@
+import asyncio
+import csv
+import itertools
+import json
+import logging
+import os
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, Iterable, Iterator, Optional, Set, TextIO
+
+from .concurrency import LoopLocal, cancel_quietly
+from .config import Config
+
+logger = logging.getLogger(__name__)
+
+# Rows read from the input per executor hop
+READ_BATCH = 64
+
+# Companies in progress across every bulk batch in the process
+bulk_slots: LoopLocal[asyncio.Semaphore] = LoopLocal(lambda: asyncio.Semaphore(Config.BULK_CONCURRENCY))
+
+@dataclass
+class BulkRow:
+    website: str
+    titles: str
+
+    @property
+    def key(self) -> str:
+        """Identity used for checkpointing"""
+        return f"{self.website.strip().lower()}|{self.titles.strip().lower()}"
+
+def detect_format(filename: str) -> str:
+    return 'csv' if filename.lower().endswith('.csv') else 'jsonl'
+
+def _read_jsonl(source: TextIO) -> Iterator[Dict]:
+    for number, line in enumerate(source, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            logger.warning(f"Skipping bulk line {number} that is not valid JSON: {str(e)}")
+            continue
+        if not isinstance(record, dict):
+            logger.warning(f"Skipping bulk line {number} that is not a JSON object: {line.strip()[:200]}")
+            continue
+        yield record
+
+def read_rows(source: TextIO, fmt: str) -> Iterator[BulkRow]:
+    """Lazily read (website, titles) rows from CSV with a header, or JSONL
+
+    Titles may be a comma-separated string or, in JSONL, a list. Malformed
+    rows are logged and skipped.
+    """
+    records = csv.DictReader(source) if fmt == 'csv' else _read_jsonl(source)
+    for record in records:
+        website = record.get('website') or ''
+        titles = record.get('titles') or ''
+        if isinstance(titles, list):
+            titles = ', '.join(str(title) for title in titles)
+        if not isinstance(website, str) or not isinstance(titles, str) \
+                or not website.strip() or not titles.strip():
+            logger.warning(f"Skipping bulk row without website or titles: {record}")
+            continue
+        yield BulkRow(website=website.strip(), titles=titles)
+
+class Checkpoint:
+    """Append-only file of successfully researched row keys, so an interrupted batch can resume
+
+    Failed rows are not recorded, so a resume retries them.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.done: Set[str] = set()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if os.path.exists(path):
+            with open(path, 'r') as f:
+                self.done = {line.rstrip('\n') for line in f if line.strip()}
+        self._file = open(path, 'a')
+
+    def mark(self, key: str) -> None:
+        self.done.add(key)
+        self._file.write(key + '\n')
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+class BulkRunner:
+    """Stream rows through process_company with a global concurrency limit
+
+    Results are yielded as soon as each company finishes, in completion
+    order, and only a bounded window of rows is held in memory. A successful
+    row is checkpointed once its result has been consumed. By default every
+    runner in the process shares ``bulk_slots``; an explicit ``concurrency``
+    (e.g. from the CLI) gives the runner its own limit instead.
+    """
+
+    def __init__(self, agent, concurrency: Optional[int] = None,
+                 checkpoint: Optional[Checkpoint] = None):
+        self.agent = agent
+        self.concurrency = concurrency or Config.BULK_CONCURRENCY
+        self.checkpoint = checkpoint
+        self.slots = bulk_slots if concurrency is None else LoopLocal(lambda: asyncio.Semaphore(concurrency))
+
+    async def run(self, rows: Iterable[BulkRow]) -> AsyncIterator[Dict]:
+        pending: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency * 2)
+        results: asyncio.Queue = asyncio.Queue()
+
+        async def feed() -> None:
+            loop = asyncio.get_running_loop()
+            iterator = iter(rows)
+            try:
+                while True:
+                    # Reading and parsing the input is blocking file I/O; keep it off the loop
+                    batch = await loop.run_in_executor(None, lambda: list(itertools.islice(iterator, READ_BATCH)))
+                    if not batch:
+                        break
+                    for row in batch:
+                        if self.checkpoint and row.key in self.checkpoint.done:
+                            continue
+                        await pending.put(row)
+            except Exception as e:
+                # Unreadable input ends the batch, but rows already queued still finish
+                logger.error(f"Stopped reading bulk input: {str(e)}")
+            for _ in range(self.concurrency):
+                await pending.put(None)
+
+        async def work() -> None:
+            while True:
+                row = await pending.get()
+                if row is None:
+                    break
+                record = {"website": row.website, "titles": row.titles}
+                try:
+                    async with self.slots.get():
+                        record["result"] = await self.agent.process_company(row.website, row.titles)
+                    record["success"] = True
+                except Exception as e:
+                    logger.error(f"Bulk research failed for {row.website}: {str(e)}")
+                    record["error"] = str(e)
+                    record["success"] = False
+                await results.put((row, record))
+
+        feeder = asyncio.ensure_future(feed())
+        workers = [asyncio.ensure_future(work()) for _ in range(self.concurrency)]
+        remaining = asyncio.ensure_future(asyncio.gather(feeder, *workers))
+        try:
+            while True:
+                getter = asyncio.ensure_future(results.get())
+                await asyncio.wait({getter, remaining}, return_when=asyncio.FIRST_COMPLETED)
+                if not getter.done():
+                    getter.cancel()
+                    break
+                row, record = getter.result()
+                yield record
+                if self.checkpoint and record["success"]:
+                    self.checkpoint.mark(row.key)
+            while not results.empty():
+                row, record = results.get_nowait()
+                yield record
+                if self.checkpoint and record["success"]:
+                    self.checkpoint.mark(row.key)
+            remaining.result()
+        finally:
+            cancel_quietly(remaining)
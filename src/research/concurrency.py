@@ -0,0 +1,45 @@
+import asyncio
+import threading
+import weakref
+from typing import Callable, Generic, List, Tuple, TypeVar
+
+T = TypeVar('T')
+
+def cancel_quietly(future: asyncio.Future) -> None:
+    """Cancel a future, and its children for a gather, without 'exception never retrieved' noise"""
+    future.cancel()
+    future.add_done_callback(lambda f: f.cancelled() or f.exception())
+
+class LoopLocal(Generic[T]):
+    """Lazily create one instance of a loop-bound object per running event loop.
+
+    Semaphores, sessions and futures are tied to the loop they were created on,
+    so objects shared by long-lived components are kept per loop instead.
+    """
+
+    def __init__(self, factory: Callable[[], T]):
+        self._factory = factory
+        self._items: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, T]" = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def get(self) -> T:
+        """Return the instance for the running loop, creating it if needed"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            item = self._items.get(loop)
+            if item is None:
+                item = self._items[loop] = self._factory()
+            return item
+
+    def pop(self) -> T:
+        """Remove and return the instance for the running loop, if any"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            return self._items.pop(loop, None)
+
+    def drain(self) -> List[Tuple[asyncio.AbstractEventLoop, T]]:
+        """Remove and return the instances for every loop"""
+        with self._lock:
+            items = list(self._items.items())
+            self._items.clear()
+            return items
@@ -8,6 +8,127 @@ class ConfigurationError(Exception):
     pass
 
 class Config:
+    # SQLite database shared by the web app and the persistent caches
+    DATABASE_PATH = os.getenv('DATABASE_PATH', 'sdr_researcher.sqlite')
+
+    # Tavily search concurrency cap and per-query timeout (seconds)
+    SEARCH_MAX_CONCURRENCY = int(os.getenv('SEARCH_MAX_CONCURRENCY', '4'))
+    SEARCH_TIMEOUT = float(os.getenv('SEARCH_TIMEOUT', '15'))
+
+    # Search result cache: memory budget and TTL (seconds) per query class
+    SEARCH_CACHE_MAX_BYTES = int(os.getenv('SEARCH_CACHE_MAX_BYTES', str(16 * 1024 * 1024)))
+    SEARCH_CACHE_TTL = float(os.getenv('SEARCH_CACHE_TTL', str(24 * 3600)))
+    SEARCH_CACHE_NEWS_TTL = float(os.getenv('SEARCH_CACHE_NEWS_TTL', '3600'))
+    SEARCH_CACHE_PEOPLE_TTL = float(os.getenv('SEARCH_CACHE_PEOPLE_TTL', str(3 * 24 * 3600)))
+    SEARCH_CACHE_PROFILE_TTL = float(os.getenv('SEARCH_CACHE_PROFILE_TTL', str(7 * 24 * 3600)))
+
+    # Number of job titles researched concurrently in the people stage
+    PEOPLE_MAX_CONCURRENCY = int(os.getenv('PEOPLE_MAX_CONCURRENCY', '4'))
+
+    # Worker threads executing queued research jobs
+    JOB_WORKERS = int(os.getenv('JOB_WORKERS', '2'))
+    # Seconds between heartbeats on running jobs, and the heartbeat age after
+    # which another process treats a running job's owner as dead and requeues it
+    JOB_HEARTBEAT_INTERVAL = float(os.getenv('JOB_HEARTBEAT_INTERVAL', '10'))
+    JOB_STALE_AFTER = float(os.getenv('JOB_STALE_AFTER', '60'))
+
+    # code.py research loop: "iterative" searches and re-summarizes one topic at a
+    # time; "map_reduce" searches every topic at once, summarizes chunks of
+    # sources in parallel and merges them in one final call
+    RESEARCH_MODE = os.getenv('RESEARCH_MODE', 'iterative')
+    RESEARCH_CHUNK_SIZE = int(os.getenv('RESEARCH_CHUNK_SIZE', '3'))
+    RESEARCH_MAP_CONCURRENCY = int(os.getenv('RESEARCH_MAP_CONCURRENCY', '4'))
+
+    # Iterative research stopping: a search batch whose novelty (new URLs blended
+    # with unseen text, 0-1) falls below the threshold ends the loop, as do the
+    # hard caps on search loops and estimated tokens
+    RESEARCH_NOVELTY_THRESHOLD = float(os.getenv('RESEARCH_NOVELTY_THRESHOLD', '0.2'))
+    RESEARCH_NOVELTY_URL_WEIGHT = float(os.getenv('RESEARCH_NOVELTY_URL_WEIGHT', '0.5'))
+    RESEARCH_MAX_LOOPS = int(os.getenv('RESEARCH_MAX_LOOPS', '6'))
+    RESEARCH_MAX_TOKENS = int(os.getenv('RESEARCH_MAX_TOKENS', '20000'))
+
+    # Companies researched at once in bulk mode, across every batch in the process
+    BULK_CONCURRENCY = int(os.getenv('BULK_CONCURRENCY', '4'))
+    # Where /bulk uploads keep their checkpoints so a re-upload resumes
+    BULK_CHECKPOINT_DIR = os.getenv('BULK_CHECKPOINT_DIR', os.path.join('data', 'bulk'))
+
+    # LLM model, per-call timeout (seconds) and cap on concurrent completions
+    LLM_MODEL = os.getenv('LLM_MODEL', 'gpt-4o-mini')
+    LLM_TIMEOUT = float(os.getenv('LLM_TIMEOUT', '60'))
+    LLM_MAX_IN_FLIGHT = int(os.getenv('LLM_MAX_IN_FLIGHT', '8'))
+
+    # LLM response cache: TTL (seconds), memory tier budget and SQLite row cap
+    LLM_CACHE_ENABLED = os.getenv('LLM_CACHE_ENABLED', 'true').lower() == 'true'
+    LLM_CACHE_TTL = float(os.getenv('LLM_CACHE_TTL', str(7 * 24 * 3600)))
+    LLM_CACHE_MAX_BYTES = int(os.getenv('LLM_CACHE_MAX_BYTES', str(16 * 1024 * 1024)))
+    LLM_CACHE_MAX_ROWS = int(os.getenv('LLM_CACHE_MAX_ROWS', '10000'))
+
+    # HTML text extraction: backend ("stream", "bs4" or "lxml"; empty means
+    # stream, which matches bs4 exactly) and worker processes (0 extracts inline)
+    EXTRACTION_BACKEND = os.getenv('EXTRACTION_BACKEND', '')
+    EXTRACTION_WORKERS = int(os.getenv('EXTRACTION_WORKERS', '2'))
+
+    # Email lookup cache TTLs (seconds) for found emails and confirmed misses
+    EMAIL_CACHE_TTL = float(os.getenv('EMAIL_CACHE_TTL', str(30 * 24 * 3600)))
+    EMAIL_CACHE_MISS_TTL = float(os.getenv('EMAIL_CACHE_MISS_TTL', str(3 * 24 * 3600)))
+
+    # Learned email patterns answer locally once this confident over enough confirmed emails
+    EMAIL_PATTERN_THRESHOLD = float(os.getenv('EMAIL_PATTERN_THRESHOLD', '0.8'))
+    EMAIL_PATTERN_MIN_OBSERVATIONS = int(os.getenv('EMAIL_PATTERN_MIN_OBSERVATIONS', '2'))
+
+    # Provider endpoints; override to point at a proxy or the local fakes in
+    # benchmarks/bench_e2e.py (empty uses the provider's default)
+    TAVILY_BASE_URL = os.getenv('TAVILY_BASE_URL', '')
+    LLM_API_BASE = os.getenv('LLM_API_BASE', '')
+    FINDYMAIL_BASE_URL = os.getenv('FINDYMAIL_BASE_URL', 'https://app.findymail.com')
+
+    # Provider call recording: "record" captures every response to REPLAY_PATH,
+    # "replay" answers from it with no network, "off" (default) does neither
+    REPLAY_MODE = os.getenv('REPLAY_MODE', 'off')
+    REPLAY_PATH = os.getenv('REPLAY_PATH', os.path.join('data', 'cassette.jsonl.gz'))
+
+    # Token-bucket rates (requests/second) and burst sizes per provider
+    TAVILY_RATE = float(os.getenv('TAVILY_RATE', '5'))
+    TAVILY_BURST = float(os.getenv('TAVILY_BURST', '10'))
+    LLM_RATE = float(os.getenv('LLM_RATE', '10'))
+    LLM_BURST = float(os.getenv('LLM_BURST', '20'))
+    FINDYMAIL_RATE = float(os.getenv('FINDYMAIL_RATE', '2'))
+    FINDYMAIL_BURST = float(os.getenv('FINDYMAIL_BURST', '5'))
+    HOST_RATE = float(os.getenv('HOST_RATE', '2'))
+    HOST_BURST = float(os.getenv('HOST_BURST', '4'))
+
+    # Retries for throttled calls: attempts and backoff bounds (seconds)
+    RATE_LIMIT_MAX_RETRIES = int(os.getenv('RATE_LIMIT_MAX_RETRIES', '4'))
+    RATE_LIMIT_BASE_DELAY = float(os.getenv('RATE_LIMIT_BASE_DELAY', '0.5'))
+    RATE_LIMIT_MAX_DELAY = float(os.getenv('RATE_LIMIT_MAX_DELAY', '30'))
+
+    # Shared HTTP connection pool used by the scraper and email finder
+    HTTP_POOL_LIMIT = int(os.getenv('HTTP_POOL_LIMIT', '100'))
+    HTTP_POOL_LIMIT_PER_HOST = int(os.getenv('HTTP_POOL_LIMIT_PER_HOST', '8'))
+    HTTP_DNS_CACHE_TTL = int(os.getenv('HTTP_DNS_CACHE_TTL', '300'))
+    HTTP_KEEPALIVE_TIMEOUT = float(os.getenv('HTTP_KEEPALIVE_TIMEOUT', '30'))
+
+    # In-memory scraped page cache: byte budget and entry TTL (seconds)
+    PAGE_CACHE_MAX_BYTES = int(os.getenv('PAGE_CACHE_MAX_BYTES', str(64 * 1024 * 1024)))
+    PAGE_CACHE_TTL = float(os.getenv('PAGE_CACHE_TTL', '3600'))
+
+    # Solutions catalog: file location, how often to check it for edits (seconds)
+    # and the word overlap needed for a fuzzy category match
+    SOLUTIONS_PATH = os.getenv('SOLUTIONS_PATH', 'solutions.json')
+    SOLUTIONS_RELOAD_INTERVAL = float(os.getenv('SOLUTIONS_RELOAD_INTERVAL', '5'))
+    SOLUTIONS_MIN_SIMILARITY = float(os.getenv('SOLUTIONS_MIN_SIMILARITY', '0.5'))
+
+    # Prompt context packing: estimated token budget per prompt and the shingle
+    # overlap above which two passages count as near-duplicates
+    CONTEXT_TOKENS_DESCRIPTION = int(os.getenv('CONTEXT_TOKENS_DESCRIPTION', '1500'))
+    CONTEXT_TOKENS_CHALLENGES = int(os.getenv('CONTEXT_TOKENS_CHALLENGES', '2500'))
+    CONTEXT_TOKENS_PERSON = int(os.getenv('CONTEXT_TOKENS_PERSON', '800'))
+    CONTEXT_DEDUPE_THRESHOLD = float(os.getenv('CONTEXT_DEDUPE_THRESHOLD', '0.6'))
+
+    # Scraper download guards: bytes read per page and concurrent fetches per host
+    SCRAPE_MAX_BYTES = int(os.getenv('SCRAPE_MAX_BYTES', str(2 * 1024 * 1024)))
+    SCRAPE_MAX_PER_HOST = int(os.getenv('SCRAPE_MAX_PER_HOST', '2'))
+
     @staticmethod
     def validate_api_keys() -> None:
         """Validate required API keys are present and well-formed"""
@@ -0,0 +1,146 @@
+import math
+import re
+import zlib
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+from .config import Config
+
+WORD = re.compile(r"\w+")
+SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+# Roughly four characters per token for English prose with the OpenAI tokenizers
+CHARS_PER_TOKEN = 4
+SHINGLE_SIZE = 5
+PASSAGE_WORDS = 80
+# Most of the budget any one source may take when there are others to include
+MAX_SOURCE_SHARE = 0.5
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate, good enough for budgeting"""
+    return len(text) // CHARS_PER_TOKEN + 1
+
+def words(text: str) -> List[str]:
+    return WORD.findall(text.lower())
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> FrozenSet[int]:
+    """Hashed word n-grams of a text, used for near-duplicate detection"""
+    tokens = words(text)
+    if len(tokens) < size:
+        return frozenset([zlib.crc32(' '.join(tokens).encode())]) if tokens else frozenset()
+    return frozenset(
+        zlib.crc32(' '.join(tokens[i:i + size]).encode())
+        for i in range(len(tokens) - size + 1)
+    )
+
+def jaccard(a: FrozenSet[int], b: FrozenSet[int]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+def split_passages(text: str, max_words: int = PASSAGE_WORDS) -> List[str]:
+    """Split page text into passages of whole sentences, at most max_words long
+
+    Sentences longer than max_words (lists and headings often have no
+    sentence punctuation) are cut into max_words chunks.
+    """
+    passages, current, count = [], [], 0
+    for sentence in SENTENCE_END.split(text.strip()):
+        tokens = sentence.split()
+        pieces = [' '.join(tokens[i:i + max_words]) for i in range(0, len(tokens), max_words)] \
+            if len(tokens) > max_words else [sentence]
+        for piece in pieces:
+            length = len(piece.split())
+            if current and count + length > max_words:
+                passages.append(' '.join(current))
+                current, count = [], 0
+            current.append(piece)
+            count += length
+    if current:
+        passages.append(' '.join(current))
+    return [passage for passage in passages if passage]
+
+def truncate_to_tokens(text: str, tokens: int) -> str:
+    limit = tokens * CHARS_PER_TOKEN
+    if len(text) <= limit:
+        return text
+    cut = text[:limit]
+    # Prefer to end on a word boundary
+    return cut[:cut.rfind(' ')] if ' ' in cut else cut
+
+@dataclass
+class Passage:
+    source: str
+    text: str
+    position: int = 0
+    score: float = 0.0
+
+class ContextBuilder:
+    """Pack the most relevant, non-duplicate passages into a token budget
+
+    Passages are ranked by overlap with the focus terms, with a small bonus
+    for appearing early in their source, then taken greedily while they fit.
+    A passage whose shingles overlap an already chosen one by at least
+    ``dedupe_threshold`` (Jaccard) is dropped as a near-duplicate. When
+    passages come from several sources, none may take more than
+    ``MAX_SOURCE_SHARE`` of the budget. The chosen passages are returned in
+    their original order.
+    """
+
+    def __init__(self, budget: int, focus: str = '', dedupe_threshold: Optional[float] = None):
+        self.budget = budget
+        self.focus = frozenset(words(focus))
+        self.dedupe_threshold = Config.CONTEXT_DEDUPE_THRESHOLD if dedupe_threshold is None else dedupe_threshold
+
+    def score(self, passage: Passage) -> float:
+        tokens = words(passage.text)
+        if not tokens:
+            return 0.0
+        overlap = sum(1 for token in tokens if token in self.focus)
+        position_bonus = 1.0 / (1 + passage.position)
+        return overlap / math.sqrt(len(tokens)) + 0.5 * position_bonus
+
+    def select(self, passages: Iterable[Passage]) -> List[Passage]:
+        candidates = list(passages)
+        for passage in candidates:
+            passage.score = self.score(passage)
+        ranked = sorted(enumerate(candidates), key=lambda item: (-item[1].score, item[0]))
+
+        multi_source = len({passage.source for passage in candidates}) > 1
+        source_cap = int(self.budget * MAX_SOURCE_SHARE) if multi_source else self.budget
+        spent: Dict[str, int] = {}
+
+        chosen: List[Tuple[int, Passage]] = []
+        chosen_shingles: List[FrozenSet[int]] = []
+        remaining = self.budget
+        for index, passage in ranked:
+            if remaining <= 0:
+                break
+            fingerprint = shingles(passage.text)
+            if any(jaccard(fingerprint, seen) >= self.dedupe_threshold for seen in chosen_shingles):
+                continue
+            allowed = min(remaining, source_cap - spent.get(passage.source, 0))
+            if allowed <= 0:
+                continue
+            cost = estimate_tokens(passage.text)
+            if cost > allowed:
+                if chosen:
+                    continue
+                # Never come back empty-handed: trim the best passage to fit
+                passage = Passage(passage.source, truncate_to_tokens(passage.text, allowed),
+                                  passage.position, passage.score)
+                cost = allowed
+            chosen.append((index, passage))
+            chosen_shingles.append(fingerprint)
+            spent[passage.source] = spent.get(passage.source, 0) + cost
+            remaining -= cost
+        return [passage for _, passage in sorted(chosen, key=lambda item: item[0])]
+
+    def build(self, sources: Iterable[Tuple[str, List[str]]]) -> List[Passage]:
+        """Select passages from (source, texts) pairs; long texts are split first"""
+        passages = []
+        for source, texts in sources:
+            position = 0
+            for text in texts:
+                for chunk in split_passages(text):
+                    passages.append(Passage(source, chunk, position))
+                    position += 1
+        return self.select(passages)
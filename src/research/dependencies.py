@@ -1,5 +1,10 @@
 from dataclasses import dataclass, field
-from typing import List, Dict
+from typing import Awaitable, Callable, List, Dict
+import asyncio
+import logging
+from .novelty import NoveltyTracker
+
+logger = logging.getLogger(__name__)
 
 @dataclass
 class ResearchDeps:
@@ -10,13 +15,14 @@ class ResearchDeps:
     search_query: str = None
     current_summary: str = None
     final_summary: str = None
-    sources: List[str] = field(default_factory=list)
+    sources: List[dict] = field(default_factory=list)
     latest_web_search_result: str = None
     research_loop_count: int = 0
     detailed_sources: List[dict] = field(default_factory=list)
     content_cache: Dict[str, str] = field(default_factory=dict)
     processing_chunks: List[List[dict]] = field(default_factory=list)
     parallel_summaries: List[str] = field(default_factory=list)
+    novelty: NoveltyTracker = field(default_factory=NoveltyTracker)
 
     def get_formatted_prompt(self) -> str:
         """Format the prompt template with the company website"""
@@ -30,9 +36,30 @@ class ResearchDeps:
         if 'url' in source and 'full_content' in source:
             self.content_cache[source['url']] = source['full_content']
 
-    async def process_sources_concurrently(self, chunk_size: int = 3) -> None:
-        """Split and process sources in parallel chunks"""
+    async def process_sources_concurrently(self, summarize: Callable[[List[dict]], Awaitable[str]],
+                                           chunk_size: int = 3, concurrency: int = 4) -> List[str]:
+        """Summarize sources in parallel chunks into parallel_summaries, in source order
+
+        Chunks whose summary fails are logged and left out.
+        """
         self.processing_chunks = [
             self.sources[i:i + chunk_size] 
             for i in range(0, len(self.sources), chunk_size)
-        ]
\ No newline at end of file
+        ]
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def summarize_chunk(chunk: List[dict]) -> str:
+            async with semaphore:
+                return await summarize(chunk)
+
+        summaries = await asyncio.gather(
+            *(summarize_chunk(chunk) for chunk in self.processing_chunks),
+            return_exceptions=True
+        )
+        self.parallel_summaries = []
+        for index, summary in enumerate(summaries):
+            if isinstance(summary, Exception):
+                logger.error(f"Summarizing source chunk {index} failed: {str(summary)}")
+            elif summary:
+                self.parallel_summaries.append(summary)
+        return self.parallel_summaries
\ No newline at end of file
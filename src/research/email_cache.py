@@ -0,0 +1,49 @@
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from .config import Config
+from .page_store import normalize_url
+from .storage import connect
+
+@dataclass
+class CachedEmail:
+    email: Optional[str]
+    source: str  # "api" for a FindyMail result, "pattern" for a fallback guess
+    found: bool
+
+def email_cache_key(first_name: str, last_name: str, domain: str, linkedin_url: Optional[str] = None) -> str:
+    name = ' '.join(f"{first_name} {last_name}".lower().split())
+    return f"{name}|{domain.strip().lower()}|{normalize_url(linkedin_url) if linkedin_url else ''}"
+
+class EmailCache:
+    """SQLite cache of email lookups, including explicit misses with a shorter TTL"""
+
+    def __init__(self, path: Optional[str] = None, ttl: Optional[float] = None,
+                 miss_ttl: Optional[float] = None):
+        self.ttl = ttl or Config.EMAIL_CACHE_TTL
+        self.miss_ttl = miss_ttl or Config.EMAIL_CACHE_MISS_TTL
+        self._conn = connect(path)
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CachedEmail]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT email, source, found FROM email_cache WHERE key = ? AND expires_at > ?",
+                (key, time.time())
+            ).fetchone()
+        if row is None:
+            return None
+        email, source, found = row
+        return CachedEmail(email=email, source=source, found=bool(found))
+
+    def put(self, key: str, email: Optional[str], source: str, found: bool) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO email_cache (key, email, source, found, created_at, expires_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, email, source, int(found), now, now + (self.ttl if found else self.miss_ttl))
+            )
+            self._conn.commit()
@@ -1,50 +1,106 @@
-import aiohttp
-from typing import Optional
+from typing import Optional, Tuple
 import logging
 from .config import Config
+from .email_cache import EmailCache, email_cache_key
+from .email_patterns import EmailPatternLearner
+from .http import HttpClient, http_client
+from .metrics import span
+from .rate_limit import RateLimiter, RateLimitError, THROTTLE_STATUSES, parse_retry_after, rate_limiter
+from .replay import Cassette, cassette as shared_cassette
+from .storage import run_db
 
 logger = logging.getLogger(__name__)
 
 class EmailFinder:
     """Email finder using FindyMail API"""
     
-    def __init__(self):
+    def __init__(self, http: HttpClient = http_client, limiter: RateLimiter = rate_limiter,
+                 cache: Optional[EmailCache] = None, patterns: Optional[EmailPatternLearner] = None,
+                 cassette: Cassette = shared_cassette):
+        self.http = http
+        self.limiter = limiter
+        self.cassette = cassette
+        self.cache = cache if cache is not None else EmailCache()
+        self.patterns = patterns if patterns is not None else EmailPatternLearner()
         self.api_key = Config.get_api_key('FINDYMAIL_API_KEY')
-        self.base_url = "https://app.findymail.com/api/search/name"
+        self.base_url = f"{Config.FINDYMAIL_BASE_URL.rstrip('/')}/api/search/name"
         self.headers = {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json"
         }
 
+    async def _lookup(self, full_name: str, domain: str, linkedin_url: Optional[str]) -> Tuple[int, Optional[str]]:
+        """Single FindyMail request; returns (status, email) and raises RateLimitError when throttled"""
+        session = self.http.session()
+        async with session.post(
+            self.base_url,
+            headers=self.headers,
+            json={
+                "name": full_name,
+                "domain": domain,
+                # Could add webhook_url here if needed
+                "linkedin_url": linkedin_url  # Additional context that might help
+            }
+        ) as response:
+            if response.status in THROTTLE_STATUSES:
+                raise RateLimitError(
+                    f"FindyMail API: Rate limited ({response.status})",
+                    retry_after=parse_retry_after(response.headers.get("Retry-After"))
+                )
+            if response.status == 200:
+                data = await response.json()
+                return response.status, data.get("contact", {}).get("email")
+            return response.status, None
+
     async def find_email(self, first_name: str, last_name: str, domain: str, linkedin_url: Optional[str] = None) -> Optional[str]:
-        """Find email using FindyMail API"""
+        """Find email using FindyMail API, answering repeat lookups from the cache"""
         try:
             full_name = f"{first_name} {last_name}"
+            key = email_cache_key(first_name, last_name, domain, linkedin_url)
+
+            cached = await run_db(self.cache.get, key)
+            if cached is not None:
+                return cached.email
+
+            # The domain's format is already known well enough to skip the API
+            learned = await run_db(self.patterns.predict, first_name, last_name, domain)
+            if learned:
+                return learned
+
+            fallback = (
+                await run_db(self.patterns.predict, first_name, last_name, domain, confident_only=False)
+                or f"{first_name.lower()}.{last_name.lower()}@{domain}"
+            )
             
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    self.base_url,
-                    headers=self.headers,
-                    json={
-                        "name": full_name,
-                        "domain": domain,
-                        # Could add webhook_url here if needed
-                        "linkedin_url": linkedin_url  # Additional context that might help
-                    }
-                ) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        if data.get("contact", {}).get("email"):
-                            return data["contact"]["email"]
-                    elif response.status == 402:
-                        logger.error("FindyMail API: No credits remaining")
-                    elif response.status == 423:
-                        logger.error("FindyMail API: Rate limited")
-                    else:
-                        logger.error(f"FindyMail API error: {response.status}")
+            try:
+                with span('findymail_lookup'):
+                    status, email = await self.cassette.call(
+                        'findymail',
+                        {'name': full_name, 'domain': domain, 'linkedin_url': linkedin_url},
+                        lambda: self.limiter.call(
+                            'findymail',
+                            lambda: self._lookup(full_name, domain, linkedin_url)
+                        ),
+                        label=f"{full_name} @ {domain}"
+                    )
+            except RateLimitError:
+                logger.error("FindyMail API: Rate limited, retries exhausted")
+                status, email = None, None
+
+            if email:
+                await run_db(self.cache.put, key, email, source="api", found=True)
+                await run_db(self.patterns.observe, first_name, last_name, domain, email)
+                return email
+            elif status in (200, 404):
+                # FindyMail has no address for this person; remember that for a shorter time
+                await run_db(self.cache.put, key, fallback, source="pattern", found=False)
+            elif status == 402:
+                logger.error("FindyMail API: No credits remaining")
+            elif status is not None:
+                logger.error(f"FindyMail API error: {status}")
             
             # Fallback to pattern-based email if API fails
-            return f"{first_name.lower()}.{last_name.lower()}@{domain}"
+            return fallback
             
         except Exception as e:
             logger.error(f"Error finding email: {str(e)}")
@@ -0,0 +1,110 @@
+import re
+import threading
+import unicodedata
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from .config import Config
+from .storage import connect
+
+# Local-part formats seen in company addresses, keyed by a readable name
+PATTERNS: Dict[str, str] = {
+    'first.last': '{first}.{last}',
+    'firstlast': '{first}{last}',
+    'flast': '{f}{last}',
+    'f.last': '{f}.{last}',
+    'first': '{first}',
+    'first_last': '{first}_{last}',
+    'first-last': '{first}-{last}',
+    'firstl': '{first}{l}',
+    'lastfirst': '{last}{first}',
+    'last.first': '{last}.{first}',
+    'lastf': '{last}{f}',
+    'last': '{last}',
+}
+
+def _name_part(value: str) -> str:
+    """ASCII-fold and drop everything but letters and digits"""
+    folded = unicodedata.normalize('NFKD', value).encode('ascii', 'ignore').decode('ascii')
+    return re.sub(r'[^a-z0-9]', '', folded.lower())
+
+def render(pattern: str, first_name: str, last_name: str, domain: str) -> Optional[str]:
+    first, last = _name_part(first_name), _name_part(last_name)
+    if not first or not last:
+        return None
+    local = PATTERNS[pattern].format(first=first, last=last, f=first[0], l=last[0])
+    return f"{local}@{domain.lower()}"
+
+def matching_patterns(first_name: str, last_name: str, email: str) -> List[str]:
+    """Every known pattern that produces this address's local part"""
+    local, _, domain = email.lower().partition('@')
+    return [
+        pattern for pattern in PATTERNS
+        if render(pattern, first_name, last_name, domain) == f"{local}@{domain}"
+    ]
+
+@dataclass
+class PatternEstimate:
+    pattern: str
+    confidence: float  # share of confirmed addresses at the domain that fit the pattern
+    observations: int
+
+class EmailPatternLearner:
+    """Learn each domain's address format from confirmed FindyMail results"""
+
+    def __init__(self, path: Optional[str] = None, threshold: Optional[float] = None,
+                 min_observations: Optional[int] = None):
+        self.threshold = threshold or Config.EMAIL_PATTERN_THRESHOLD
+        self.min_observations = min_observations or Config.EMAIL_PATTERN_MIN_OBSERVATIONS
+        self._conn = connect(path)
+        self._lock = threading.Lock()
+
+    def observe(self, first_name: str, last_name: str, domain: str, email: str) -> None:
+        """Record a confirmed address"""
+        domain = domain.lower()
+        if not email.lower().endswith('@' + domain):
+            return
+        patterns = matching_patterns(first_name, last_name, email)
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO email_pattern_domains (domain, observations) VALUES (?, 1) "
+                "ON CONFLICT(domain) DO UPDATE SET observations = observations + 1",
+                (domain,)
+            )
+            for pattern in patterns:
+                self._conn.execute(
+                    "INSERT INTO email_patterns (domain, pattern, hits) VALUES (?, ?, 1) "
+                    "ON CONFLICT(domain, pattern) DO UPDATE SET hits = hits + 1",
+                    (domain, pattern)
+                )
+            self._conn.commit()
+
+    def estimate(self, domain: str) -> Optional[PatternEstimate]:
+        """Most likely pattern for the domain, or None if unknown or tied"""
+        domain = domain.lower()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT observations FROM email_pattern_domains WHERE domain = ?", (domain,)
+            ).fetchone()
+            ranked = self._conn.execute(
+                "SELECT pattern, hits FROM email_patterns WHERE domain = ? ORDER BY hits DESC LIMIT 2",
+                (domain,)
+            ).fetchall()
+        if not row or not ranked:
+            return None
+        if len(ranked) > 1 and ranked[1][1] == ranked[0][1]:
+            return None
+        pattern, hits = ranked[0]
+        return PatternEstimate(pattern=pattern, confidence=hits / row[0], observations=row[0])
+
+    def predict(self, first_name: str, last_name: str, domain: str,
+                confident_only: bool = True) -> Optional[str]:
+        """Address from the learned pattern; with ``confident_only``, only above the threshold"""
+        estimate = self.estimate(domain)
+        if estimate is None:
+            return None
+        if confident_only and (
+            estimate.observations < self.min_observations or estimate.confidence < self.threshold
+        ):
+            return None
+        return render(estimate.pattern, first_name, last_name, domain)
@@ -0,0 +1,158 @@
+import asyncio
+import logging
+import multiprocessing
+import re
+from concurrent.futures import ProcessPoolExecutor
+from html.parser import HTMLParser
+from typing import Callable, Dict, List, Optional
+
+from .config import Config
+
+logger = logging.getLogger(__name__)
+
+# Elements whose text is kept, and elements dropped along with everything inside them
+CONTENT_TAGS = ('p', 'h1', 'h2', 'h3', 'li')
+REMOVED_TAGS = ('script', 'style', 'nav', 'footer')
+
+# Elements that never have children, so never appear on the open-element stack
+VOID_TAGS = frozenset((
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'keygen',
+    'link', 'meta', 'param', 'source', 'track', 'wbr',
+))
+
+# lxml refuses str input that carries an XML encoding declaration, as XHTML pages often do
+XML_DECLARATION = re.compile(r'^\s*<\?xml[^>]*\?>', re.IGNORECASE)
+
+def _join(texts: List[str]) -> str:
+    return ' '.join(' '.join(text.strip() for text in texts).split())
+
+def extract_text_bs4(html: str) -> str:
+    """Reference implementation: BeautifulSoup tree walk with html.parser"""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, 'html.parser')
+    for tag in soup(list(REMOVED_TAGS)):
+        tag.decompose()
+    return _join([element.get_text() for element in soup.find_all(list(CONTENT_TAGS))])
+
+class _TextExtractor(HTMLParser):
+    """Single pass over parser events, with no tree built
+
+    Mirrors how BeautifulSoup's html.parser builder nests elements: an end
+    tag closes the most recent open element of that name and everything
+    opened inside it, and unmatched end tags are ignored.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        # (tag, index into self.texts or None, inside a removed element)
+        self.stack: List[tuple] = []
+        self.texts: List[List[str]] = []
+        self.open_content: List[int] = []
+        self.removed_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in VOID_TAGS:
+            return
+        removed = tag in REMOVED_TAGS
+        index = None
+        if removed:
+            self.removed_depth += 1
+        elif tag in CONTENT_TAGS and not self.removed_depth:
+            index = len(self.texts)
+            self.texts.append([])
+            self.open_content.append(index)
+        self.stack.append((tag, index, removed))
+
+    def handle_startendtag(self, tag, attrs):
+        # <p/> opens nothing
+        pass
+
+    def handle_endtag(self, tag):
+        for position in range(len(self.stack) - 1, -1, -1):
+            if self.stack[position][0] == tag:
+                break
+        else:
+            return
+        for _, index, removed in self.stack[position:]:
+            if removed:
+                self.removed_depth -= 1
+            if index is not None:
+                self.open_content.remove(index)
+        del self.stack[position:]
+
+    def handle_data(self, data):
+        if self.removed_depth:
+            return
+        for index in self.open_content:
+            self.texts[index].append(data)
+
+def extract_text_stream(html: str) -> str:
+    """Single-pass extractor over the stdlib parser; same output as the BeautifulSoup rule"""
+    parser = _TextExtractor()
+    parser.feed(html)
+    parser.close()
+    return _join([''.join(parts) for parts in parser.texts])
+
+def extract_text_lxml(html: str) -> str:
+    """lxml (libxml2) backend, opt-in only
+
+    Faster, but it repairs unclosed <p> and <li> tags the way browsers do, so
+    its output can differ from the BeautifulSoup rule. Pages lxml cannot
+    parse fall back to the stream extractor.
+    """
+    import lxml.html
+
+    try:
+        root = lxml.html.document_fromstring(XML_DECLARATION.sub('', html, count=1))
+    except Exception as e:
+        # e.g. "Document is empty" for comment-only bodies
+        logger.debug(f"lxml could not parse page, using the stream extractor: {str(e)}")
+        return extract_text_stream(html)
+    for element in list(root.iter(*REMOVED_TAGS)):
+        # drop_tree keeps the tail text, like BeautifulSoup's decompose
+        element.drop_tree()
+    return _join([element.text_content() for element in root.iter(*CONTENT_TAGS)])
+
+BACKENDS: Dict[str, Callable[[str], str]] = {
+    'bs4': extract_text_bs4,
+    'stream': extract_text_stream,
+    'lxml': extract_text_lxml,
+}
+
+def default_backend() -> str:
+    # stream matches the BeautifulSoup rule exactly; lxml does not on unclosed tags
+    return Config.EXTRACTION_BACKEND or 'stream'
+
+def extract_text(html: str, backend: Optional[str] = None) -> str:
+    """Text of the page's p/h1/h2/h3/li elements, minus script/style/nav/footer"""
+    return BACKENDS[backend or default_backend()](html)
+
+class ExtractionPool:
+    """Run extraction in worker processes so large pages do not stall the event loop"""
+
+    def __init__(self, workers: Optional[int] = None, backend: Optional[str] = None):
+        self.workers = Config.EXTRACTION_WORKERS if workers is None else workers
+        self.backend = backend or default_backend()
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # Forking a process that already runs the event loop and pool threads can
+            # copy held locks into the child, so start workers from a clean interpreter
+            method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=multiprocessing.get_context(method)
+            )
+        return self._executor
+
+    async def extract(self, html: str) -> str:
+        if self.workers <= 0:
+            return extract_text(html, self.backend)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_executor(), extract_text, html, self.backend)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
@@ -0,0 +1,63 @@
+import atexit
+import logging
+from typing import Optional
+
+import aiohttp
+
+from .concurrency import LoopLocal
+from .config import Config
+
+logger = logging.getLogger(__name__)
+
+class HttpClient:
+    """Shared aiohttp session backed by a pooled, keep-alive, DNS-caching connector"""
+
+    def __init__(self, limit: Optional[int] = None, limit_per_host: Optional[int] = None,
+                 dns_cache_ttl: Optional[int] = None, keepalive_timeout: Optional[float] = None):
+        self.limit = limit or Config.HTTP_POOL_LIMIT
+        self.limit_per_host = limit_per_host or Config.HTTP_POOL_LIMIT_PER_HOST
+        self.dns_cache_ttl = dns_cache_ttl or Config.HTTP_DNS_CACHE_TTL
+        self.keepalive_timeout = keepalive_timeout or Config.HTTP_KEEPALIVE_TIMEOUT
+        self._sessions = LoopLocal(self._create_session)
+
+    def _create_session(self) -> aiohttp.ClientSession:
+        connector = aiohttp.TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            use_dns_cache=True,
+            ttl_dns_cache=self.dns_cache_ttl,
+            keepalive_timeout=self.keepalive_timeout
+        )
+        return aiohttp.ClientSession(connector=connector)
+
+    def session(self) -> aiohttp.ClientSession:
+        """Return the pooled session for the running event loop"""
+        session = self._sessions.get()
+        if session.closed:
+            self._sessions.pop()
+            session = self._sessions.get()
+        return session
+
+    async def close(self) -> None:
+        """Close the session bound to the running event loop"""
+        session = self._sessions.pop()
+        if session is not None and not session.closed:
+            await session.close()
+
+    def close_all(self) -> None:
+        """Close sessions whose loops are idle; used at process shutdown"""
+        for loop, session in self._sessions.drain():
+            if session.closed or loop.is_closed() or loop.is_running():
+                continue
+            try:
+                loop.run_until_complete(session.close())
+            except Exception as e:
+                logger.error(f"Error closing HTTP session: {str(e)}")
+
+# Single connection pool shared by the scraper and the email finder
+http_client = HttpClient()
+
+def init_app(app):
+    """Tie the shared connection pool to the Flask app's lifecycle"""
+    app.extensions['http_client'] = http_client
+    atexit.register(http_client.close_all)
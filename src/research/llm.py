@@ -0,0 +1,100 @@
+import asyncio
+import logging
+from typing import Dict, List, Optional
+
+from .concurrency import LoopLocal
+from .config import Config
+from .llm_cache import LLMCache, cache_key
+from .metrics import LLM_CACHE_HITS, LLM_SECONDS, record_llm_usage, span
+from .rate_limit import RateLimiter, rate_limiter
+from .replay import Cassette, cassette as shared_cassette
+from .storage import run_db
+
+logger = logging.getLogger(__name__)
+
+_acompletion = None
+
+async def _load_acompletion():
+    """Import litellm on first use, in a worker thread so the slow import does not stall the loop"""
+    global _acompletion
+    if _acompletion is None:
+        def load():
+            from litellm import acompletion
+            return acompletion
+        _acompletion = await asyncio.get_running_loop().run_in_executor(None, load)
+    return _acompletion
+
+class LLMClient:
+    """Async chat completions with per-call timeouts and an in-flight limit"""
+
+    def __init__(self, model: Optional[str] = None, max_in_flight: Optional[int] = None,
+                 timeout: Optional[float] = None, cache: Optional[LLMCache] = None,
+                 limiter: RateLimiter = rate_limiter, cassette: Cassette = shared_cassette):
+        self.model = model or Config.LLM_MODEL
+        self.limiter = limiter
+        self.cassette = cassette
+        self.max_in_flight = max_in_flight or Config.LLM_MAX_IN_FLIGHT
+        self.timeout = timeout or Config.LLM_TIMEOUT
+        self.api_base = Config.LLM_API_BASE or None
+        self._semaphore = LoopLocal(lambda: asyncio.Semaphore(self.max_in_flight))
+        if cache is None and Config.LLM_CACHE_ENABLED:
+            cache = LLMCache()
+        self.cache = cache
+
+    async def complete(self, messages: List[Dict[str, str]], model: Optional[str] = None,
+                       timeout: Optional[float] = None, cache: bool = True,
+                       prompt_name: str = 'other', **kwargs) -> str:
+        """Run a chat completion and return the message content
+
+        Identical calls are answered from the response cache; pass
+        ``cache=False`` to always go to the provider. ``prompt_name`` labels
+        the call's latency and token metrics.
+        """
+        model = model or self.model
+        timeout = timeout or self.timeout
+        use_cache = cache and self.cache is not None
+        if use_cache:
+            key = cache_key(model, messages, **kwargs)
+            content = await run_db(self.cache.get, key)
+            if content is not None:
+                LLM_CACHE_HITS.inc(prompt=prompt_name)
+                return content
+
+        request = {'model': model, 'messages': messages, **kwargs}
+        # The endpoint stays out of the cache and cassette keys
+        call_kwargs = {**kwargs, 'api_base': self.api_base} if self.api_base else kwargs
+
+        async def attempt(acompletion):
+            # Hold an in-flight slot per attempt, so retry backoff does not keep it from other calls
+            async with self._semaphore.get():
+                return await asyncio.wait_for(
+                    acompletion(model=model, messages=messages, **call_kwargs),
+                    timeout=timeout
+                )
+
+        async def call_provider() -> Dict:
+            acompletion = await _load_acompletion()
+            response = await self.limiter.call('llm', lambda: attempt(acompletion))
+            usage = getattr(response, 'usage', None)
+            return {
+                'content': response.choices[0].message.content,
+                'usage': {
+                    'prompt_tokens': getattr(usage, 'prompt_tokens', None),
+                    'completion_tokens': getattr(usage, 'completion_tokens', None)
+                } if usage is not None else None
+            }
+
+        try:
+            with span('llm', LLM_SECONDS, prompt=prompt_name, model=model):
+                result = await self.cassette.call('llm', request, call_provider, label=prompt_name)
+        except asyncio.TimeoutError:
+            logger.error(f"LLM call to {model} timed out after {timeout}s")
+            raise
+        record_llm_usage(prompt_name, model, result['usage'])
+        content = result['content']
+        if use_cache and content is not None:
+            await run_db(self.cache.set, key, model, content)
+        return content
+
+# Shared client so the in-flight limit applies to every caller
+llm_client = LLMClient()
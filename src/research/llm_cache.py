@@ -0,0 +1,91 @@
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from .cache import TTLCache
+from .config import Config
+from .storage import connect
+
+logger = logging.getLogger(__name__)
+
+def cache_key(model: str, messages: List[Dict[str, str]], **params: Any) -> str:
+    """Hash of everything that determines a completion
+
+    ``params`` carries response_format, temperature and any other sampling
+    options, so calls differing only in e.g. max_tokens do not collide.
+    """
+    payload = json.dumps(
+        {"model": model, "messages": messages, "params": params},
+        sort_keys=True,
+        separators=(',', ':'),
+        default=str
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+class LLMCache:
+    """Completion text cache: an in-memory LRU tier in front of a SQLite tier"""
+
+    # Expired and excess rows are pruned every this many writes
+    PRUNE_INTERVAL = 100
+
+    def __init__(self, path: Optional[str] = None, ttl: Optional[float] = None,
+                 max_bytes: Optional[int] = None, max_rows: Optional[int] = None):
+        self.ttl = ttl or Config.LLM_CACHE_TTL
+        self.max_rows = max_rows or Config.LLM_CACHE_MAX_ROWS
+        self._memory = TTLCache(max_bytes=max_bytes or Config.LLM_CACHE_MAX_BYTES, ttl=self.ttl)
+        self._path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._writes = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        """Open the database on first use rather than at import; call with the lock held"""
+        if self._conn is None:
+            self._conn = connect(self._path)
+        return self._conn
+
+    def get(self, key: str) -> Optional[str]:
+        content = self._memory.get(key)
+        if content is not None:
+            return content
+        now = time.time()
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT content, expires_at FROM llm_cache WHERE key = ? AND expires_at > ?",
+                (key, now)
+            ).fetchone()
+        if row is None:
+            return None
+        content, expires_at = row
+        self._memory.set(key, content, ttl=expires_at - now)
+        return content
+
+    def set(self, key: str, model: str, content: str) -> None:
+        now = time.time()
+        self._memory.set(key, content)
+        with self._lock:
+            self._connection().execute(
+                "INSERT OR REPLACE INTO llm_cache (key, model, content, created_at, expires_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, model, content, now, now + self.ttl)
+            )
+            self._writes += 1
+            if self._writes % self.PRUNE_INTERVAL == 0:
+                self._prune(now)
+            self._conn.commit()
+
+    def _prune(self, now: float) -> None:
+        """Drop expired rows, then the oldest rows beyond max_rows"""
+        self._conn.execute("DELETE FROM llm_cache WHERE expires_at <= ?", (now,))
+        self._conn.execute(
+            "DELETE FROM llm_cache WHERE key IN ("
+            "SELECT key FROM llm_cache ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_rows,)
+        )
+
+    def stats(self) -> Dict[str, int]:
+        return self._memory.stats()
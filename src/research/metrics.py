@@ -0,0 +1,206 @@
+import bisect
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Awaitable, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, TypeVar
+
+from .rate_limit import rate_limiter
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+# Seconds; covers cache hits through slow LLM calls
+DEFAULT_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+LabelValues = Tuple[str, ...]
+# (name, type, help, [(labels, value)]) as produced by a collector
+Family = Tuple[str, str, str, List[Tuple[Dict[str, str], float]]]
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(str(value))}"' for name, value in labels.items()) + '}'
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+class Counter:
+    """Monotonic counter with labels"""
+
+    kind = 'counter'
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, value: float = 1, **labels: str) -> None:
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + value
+
+    def samples(self) -> Iterator[Tuple[str, Dict[str, str], float]]:
+        with self._lock:
+            values = list(self._values.items())
+        for key, value in sorted(values):
+            yield self.name, dict(zip(self.labelnames, key)), value
+
+class Histogram:
+    """Cumulative-bucket histogram with labels, as Prometheus expects"""
+
+    kind = 'histogram'
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: (count per bucket, with a final +Inf slot; sum; count)
+        self._values: Dict[LabelValues, List] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    def samples(self) -> Iterator[Tuple[str, Dict[str, str], float]]:
+        with self._lock:
+            values = [(key, (list(state[0]), state[1], state[2])) for key, state in self._values.items()]
+        for key, (counts, total, count) in sorted(values):
+            labels = dict(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += bucket_count
+                le = '+Inf' if bound == float('inf') else _format_value(bound)
+                yield f'{self.name}_bucket', {**labels, 'le': le}, cumulative
+            yield f'{self.name}_sum', labels, total
+            yield f'{self.name}_count', labels, count
+
+class MetricsRegistry:
+    """In-process metrics rendered in the Prometheus text exposition format"""
+
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+        self._collectors: List[Callable[[], List[Family]]] = []
+        self._lock = threading.Lock()
+
+    def _register(self, metric):
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, help, labelnames))
+
+    def histogram(self, name: str, help: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, help, labelnames, buckets))
+
+    def add_collector(self, collector: Callable[[], List[Family]]) -> None:
+        """Add a callable producing metric families from state kept elsewhere"""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        lines = []
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            lines.append(f'# HELP {metric.name} {metric.help}')
+            lines.append(f'# TYPE {metric.name} {metric.kind}')
+            for name, labels, value in metric.samples():
+                lines.append(f'{name}{_format_labels(labels)} {_format_value(value)}')
+        for collector in self._collectors:
+            try:
+                families = collector()
+            except Exception as e:
+                logger.error(f"Metrics collector failed: {str(e)}")
+                continue
+            for name, kind, help, samples in families:
+                lines.append(f'# HELP {name} {help}')
+                lines.append(f'# TYPE {name} {kind}')
+                for labels, value in samples:
+                    lines.append(f'{name}{_format_labels(labels)} {_format_value(value)}')
+        return '\n'.join(lines) + '\n'
+
+registry = MetricsRegistry()
+
+STAGE_SECONDS = registry.histogram(
+    'research_stage_seconds', 'Time spent in each research stage', ('stage',)
+)
+STAGE_ERRORS = registry.counter(
+    'research_stage_errors_total', 'Research stages that raised', ('stage',)
+)
+LLM_SECONDS = registry.histogram(
+    'research_llm_seconds', 'LLM call latency by prompt, excluding cache hits', ('prompt', 'model')
+)
+LLM_TOKENS = registry.counter(
+    'research_llm_tokens_total', 'LLM tokens used by prompt', ('prompt', 'model', 'kind')
+)
+LLM_CACHE_HITS = registry.counter(
+    'research_llm_cache_hits_total', 'LLM calls answered from the response cache', ('prompt',)
+)
+
+@contextmanager
+def span(stage: str, histogram: Optional[Histogram] = None, **labels: str) -> Iterator[None]:
+    """Time a block into the stage histogram, counting it as an error if it raises"""
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        STAGE_ERRORS.inc(stage=stage)
+        raise
+    finally:
+        elapsed = time.perf_counter() - started
+        STAGE_SECONDS.observe(elapsed, stage=stage)
+        if histogram is not None:
+            histogram.observe(elapsed, **labels)
+
+async def timed(stage: str, awaitable: Awaitable[T]) -> T:
+    """Await something inside a span"""
+    with span(stage):
+        return await awaitable
+
+def record_llm_usage(prompt: str, model: str, usage: Optional[Dict[str, int]]) -> None:
+    """Count prompt and completion tokens from a completion's usage block"""
+    if not usage:
+        return
+    for kind in ('prompt', 'completion'):
+        tokens = usage.get(f'{kind}_tokens')
+        if tokens:
+            LLM_TOKENS.inc(tokens, prompt=prompt, model=model, kind=kind)
+
+def _rate_limit_families() -> List[Family]:
+    stats: Dict[str, Dict[str, float]] = {}
+    for provider, values in rate_limiter.stats().items():
+        # Fold the per-host buckets into one series to keep label cardinality bounded
+        provider = 'host' if provider.startswith('host:') else provider
+        totals = stats.setdefault(provider, {'throttled_seconds': 0.0, 'retries': 0})
+        for name, value in values.items():
+            totals[name] += value
+    return [
+        ('rate_limit_throttled_seconds_total', 'counter',
+         'Seconds spent waiting on rate limits and throttling backoff',
+         [({'provider': provider}, values['throttled_seconds']) for provider, values in sorted(stats.items())]),
+        ('rate_limit_retries_total', 'counter', 'Throttled attempts that were retried',
+         [({'provider': provider}, values['retries']) for provider, values in sorted(stats.items())]),
+    ]
+
+registry.add_collector(_rate_limit_families)
@@ -0,0 +1,88 @@
+import logging
+from typing import Dict, List, Optional, Set
+from .config import Config
+from .context import estimate_tokens, shingles
+
+logger = logging.getLogger(__name__)
+
+def source_text(source: Dict) -> str:
+    return ' '.join(filter(None, (source.get('title'), source.get('content'))))
+
+class NoveltyTracker:
+    """Decides when iterative web research has stopped paying for itself
+
+    Each search batch is scored by how much it adds to what the run already
+    knows: the share of its URLs not yet in the sources, blended with the
+    share of its text shingles found in neither earlier sources nor the
+    running summary. Research stops once a batch scores below the threshold,
+    or when the loop or token caps are reached.
+    """
+
+    def __init__(self, threshold: Optional[float] = None, max_loops: Optional[int] = None,
+                 max_tokens: Optional[int] = None, url_weight: Optional[float] = None):
+        self.threshold = Config.RESEARCH_NOVELTY_THRESHOLD if threshold is None else threshold
+        self.max_loops = Config.RESEARCH_MAX_LOOPS if max_loops is None else max_loops
+        self.max_tokens = Config.RESEARCH_MAX_TOKENS if max_tokens is None else max_tokens
+        self.url_weight = Config.RESEARCH_NOVELTY_URL_WEIGHT if url_weight is None else url_weight
+        self.loops = 0
+        self.tokens = 0
+        self.last_novelty: Optional[float] = None
+        self._urls: Set[str] = set()
+        self._shingles: Set[int] = set()
+        # How many of the run's sources are already indexed
+        self._indexed = 0
+
+    def _index(self, sources: List[Dict]) -> None:
+        for source in sources[self._indexed:]:
+            if source.get('url'):
+                self._urls.add(source['url'])
+            self._shingles.update(shingles(source_text(source)))
+        self._indexed = len(sources)
+
+    def observe(self, results: List[Dict], sources: List[Dict], summary: Optional[str] = None) -> List[Dict]:
+        """Score a search batch against the sources gathered so far and return its new results
+
+        Call before adding the batch to sources. An empty batch (no hits, or a
+        search that failed) is not an observation and leaves the scores alone.
+        """
+        if not results:
+            logger.info("Search batch returned no results; not scoring it")
+            return []
+        self._index(sources)
+        self.loops += 1
+        self.tokens += sum(estimate_tokens(source_text(result)) for result in results)
+
+        fresh, seen = [], set(self._urls)
+        for result in results:
+            if result.get('url') not in seen:
+                seen.add(result.get('url'))
+                fresh.append(result)
+        url_novelty = len(fresh) / len(results)
+
+        batch = set()
+        for result in results:
+            batch.update(shingles(source_text(result)))
+        known = (self._shingles | shingles(summary)) if summary else self._shingles
+        text_novelty = len(batch - known) / len(batch) if batch else 0.0
+
+        self.last_novelty = self.url_weight * url_novelty + (1 - self.url_weight) * text_novelty
+        logger.info(f"Search batch {self.loops}: novelty {self.last_novelty:.2f} "
+                    f"(new URLs {url_novelty:.2f}, new text {text_novelty:.2f})")
+        return fresh
+
+    def spend(self, *texts: str) -> None:
+        """Count LLM prompt and completion text against the token cap"""
+        self.tokens += sum(estimate_tokens(text) for text in texts if text)
+
+    def is_novel(self) -> bool:
+        return self.last_novelty is None or self.last_novelty >= self.threshold
+
+    def stop_reason(self) -> Optional[str]:
+        """Why research should stop now, or None to keep searching"""
+        if self.loops >= self.max_loops:
+            return f"reached {self.max_loops} search loops"
+        if self.tokens >= self.max_tokens:
+            return f"used about {self.tokens} of {self.max_tokens} tokens"
+        if not self.is_novel():
+            return f"novelty {self.last_novelty:.2f} below {self.threshold:.2f}"
+        return None
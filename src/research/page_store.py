@@ -0,0 +1,63 @@
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+from urllib.parse import urlsplit, urlunsplit
+
+from .storage import connect
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+def normalize_url(url: str) -> str:
+    """Canonical cache key: lowercase scheme and host, no default port, fragment or trailing slash"""
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').lower()
+    if parts.port and parts.port != _DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    path = parts.path.rstrip('/') or '/'
+    return urlunsplit((scheme, host, path, parts.query, ''))
+
+@dataclass
+class StoredPage:
+    url: str
+    content: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    fetched_at: float
+
+class PageStore:
+    """SQLite-backed store of extracted page text plus HTTP validators"""
+
+    def __init__(self, path: Optional[str] = None):
+        self._conn = connect(path)
+        self._lock = threading.Lock()
+
+    def get(self, url: str) -> Optional[StoredPage]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT url, content, etag, last_modified, fetched_at FROM page_cache WHERE url = ?",
+                (normalize_url(url),)
+            ).fetchone()
+        return StoredPage(*row) if row else None
+
+    def put(self, url: str, content: str, etag: Optional[str], last_modified: Optional[str]) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO page_cache (url, content, etag, last_modified, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (normalize_url(url), content, etag, last_modified, time.time())
+            )
+            self._conn.commit()
+
+    def touch(self, url: str) -> None:
+        """Record a successful revalidation"""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE page_cache SET fetched_at = ? WHERE url = ?",
+                (time.time(), normalize_url(url))
+            )
+            self._conn.commit()
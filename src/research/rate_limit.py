@@ -0,0 +1,158 @@
+import asyncio
+import email.utils
+import logging
+import random
+import threading
+import time
+from typing import Awaitable, Callable, Dict, Optional, Tuple, TypeVar
+
+from .config import Config
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+# Status codes meaning "slow down": FindyMail signals rate limiting with 423
+THROTTLE_STATUSES = (423, 429, 503)
+
+class RateLimitError(Exception):
+    """Raised for a throttling response that should be retried"""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+def throttle_info(exc: Exception) -> Tuple[bool, Optional[float]]:
+    """Whether an exception from any provider client means throttling, and its Retry-After"""
+    if isinstance(exc, RateLimitError):
+        return True, exc.retry_after
+    response = getattr(exc, 'response', None)
+    status = getattr(exc, 'status_code', None) or getattr(response, 'status_code', None)
+    headers = getattr(response, 'headers', None) or {}
+    if status in THROTTLE_STATUSES or type(exc).__name__ in ('RateLimitError', 'UsageLimitExceededError'):
+        return True, parse_retry_after(headers.get('Retry-After') if hasattr(headers, 'get') else None)
+    return False, None
+
+class TokenBucket:
+    """Thread-safe token bucket shared by every event loop in the process
+
+    Callers reserve a token up front and sleep until it is theirs, so waiting
+    callers are served in arrival order.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Take a token and return how long to wait before using it"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            return max(wait, self._paused_until - now)
+
+    async def acquire(self) -> float:
+        """Wait for a token; returns the seconds spent waiting"""
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def pause(self, seconds: float) -> None:
+        """Hold every caller back, e.g. after the provider sent Retry-After"""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+class RateLimiter:
+    """Per-provider token buckets plus retry with jittered exponential backoff
+
+    Providers are "tavily", "llm", "findymail" and "host:<hostname>" for
+    scraped sites; hosts share the default host rate.
+    """
+
+    def __init__(self, limits: Optional[Dict[str, Tuple[float, float]]] = None,
+                 host_limit: Optional[Tuple[float, float]] = None,
+                 max_retries: Optional[int] = None, base_delay: Optional[float] = None,
+                 max_delay: Optional[float] = None):
+        self.limits = limits if limits is not None else {
+            'tavily': (Config.TAVILY_RATE, Config.TAVILY_BURST),
+            'llm': (Config.LLM_RATE, Config.LLM_BURST),
+            'findymail': (Config.FINDYMAIL_RATE, Config.FINDYMAIL_BURST),
+        }
+        self.host_limit = host_limit or (Config.HOST_RATE, Config.HOST_BURST)
+        self.max_retries = Config.RATE_LIMIT_MAX_RETRIES if max_retries is None else max_retries
+        self.base_delay = base_delay or Config.RATE_LIMIT_BASE_DELAY
+        self.max_delay = max_delay or Config.RATE_LIMIT_MAX_DELAY
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._stats: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, provider: str) -> TokenBucket:
+        with self._lock:
+            bucket = self._buckets.get(provider)
+            if bucket is None:
+                rate, capacity = self.limits.get(provider, self.host_limit)
+                bucket = self._buckets[provider] = TokenBucket(rate, capacity)
+            return bucket
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff for the given retry attempt"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    async def call(self, provider: str, func: Callable[[], Awaitable[T]]) -> T:
+        """Run ``func`` once a token is available, retrying throttled attempts"""
+        bucket = self.bucket(provider)
+        attempt = 0
+        while True:
+            self._record(provider, 'throttled_seconds', await bucket.acquire())
+            try:
+                return await func()
+            except Exception as e:
+                throttled, retry_after = throttle_info(e)
+                if not throttled or attempt >= self.max_retries:
+                    raise
+                if retry_after is not None:
+                    delay = min(retry_after, self.max_delay)
+                    bucket.pause(delay)
+                else:
+                    delay = self.backoff(attempt)
+                attempt += 1
+                logger.warning(f"{provider} throttled, retry {attempt}/{self.max_retries} in {delay:.2f}s")
+                self._record(provider, 'retries', 1)
+                self._record(provider, 'throttled_seconds', delay)
+                await asyncio.sleep(delay)
+
+    def _record(self, provider: str, name: str, value: float) -> None:
+        if not value:
+            return
+        with self._lock:
+            stats = self._stats.setdefault(provider, {'throttled_seconds': 0.0, 'retries': 0})
+            stats[name] += value
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Time spent waiting on tokens or backoff, and retry counts, per provider"""
+        with self._lock:
+            return {provider: dict(stats) for provider, stats in self._stats.items()}
+
+# Shared so every caller in the process draws from the same buckets
+rate_limiter = RateLimiter()
@@ -0,0 +1,128 @@
+import asyncio
+import atexit
+import gzip
+import hashlib
+import json
+import logging
+import os
+import threading
+from typing import Any, Awaitable, Callable, Dict, List, Optional, TypeVar
+
+from .config import Config
+from .rate_limit import RateLimitError
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+OFF = 'off'
+RECORD = 'record'
+REPLAY = 'replay'
+
+class CassetteMiss(LookupError):
+    """A replayed run made a provider call that was not recorded"""
+
+class ReplayedError(Exception):
+    """A provider failure captured while recording, raised again on replay"""
+
+def request_key(kind: str, request: Dict[str, Any]) -> str:
+    payload = json.dumps({'kind': kind, 'request': request}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+class Cassette:
+    """Records provider responses to a gzip JSON-lines file, or replays them with no network
+
+    Each line holds the request kind, a hash of the request, a short label
+    for humans and either the JSON response or the error it raised. Identical
+    requests replay their recorded responses in order, repeating the last one
+    once they run out.
+    """
+
+    def __init__(self, path: Optional[str] = None, mode: Optional[str] = None):
+        self.path = path or Config.REPLAY_PATH
+        self.mode = (mode or Config.REPLAY_MODE or OFF).lower()
+        if self.mode not in (OFF, RECORD, REPLAY):
+            raise ValueError(f"Unknown replay mode: {self.mode}")
+        self._lock = threading.Lock()
+        self._file = None
+        self._entries: Dict[str, List[Dict]] = {}
+        self._cursor: Dict[str, int] = {}
+        if self.mode == REPLAY:
+            self._load()
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != OFF
+
+    def _load(self) -> None:
+        count = 0
+        with gzip.open(self.path, 'rt', encoding='utf-8') as f:
+            try:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self._entries.setdefault(entry['key'], []).append(entry)
+                        count += 1
+            except EOFError:
+                # A recording process that died mid-write leaves a truncated last member
+                logger.warning(f"Cassette {self.path} ends early; using the {count} complete entries")
+        logger.info(f"Replaying {count} recorded responses from {self.path}")
+
+    def _write(self, entry: Dict) -> None:
+        line = json.dumps(entry, separators=(',', ':'), default=str) + '\n'
+        with self._lock:
+            if self._file is None:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                # Appending adds a gzip member, which readers handle transparently
+                self._file = gzip.open(self.path, 'at', encoding='utf-8')
+                atexit.register(self.close)
+            self._file.write(line)
+            self._file.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def _replay(self, kind: str, key: str, label: str) -> Any:
+        with self._lock:
+            entries = self._entries.get(key)
+            if not entries:
+                raise CassetteMiss(f"No recorded {kind} response for {label}")
+            index = self._cursor.get(key, 0)
+            self._cursor[key] = index + 1
+            entry = entries[min(index, len(entries) - 1)]
+        if 'error' in entry:
+            # Failures the callers handle specially come back as the same type
+            if entry['error'] == 'TimeoutError':
+                raise asyncio.TimeoutError(entry['message'])
+            if entry['error'] == 'RateLimitError':
+                raise RateLimitError(entry['message'])
+            raise ReplayedError(f"{entry['error']}: {entry['message']}")
+        return entry['response']
+
+    async def call(self, kind: str, request: Dict[str, Any], func: Callable[[], Awaitable[T]],
+                   label: str = '') -> T:
+        """Run a provider call, recording or replaying it depending on the mode
+
+        Responses must be JSON-serializable; tuples come back as lists.
+        """
+        if self.mode == OFF:
+            return await func()
+        key = request_key(kind, request)
+        if self.mode == REPLAY:
+            return self._replay(kind, key, label or key)
+        try:
+            response = await func()
+        except Exception as e:
+            self._write({'kind': kind, 'key': key, 'label': label,
+                         'error': type(e).__name__, 'message': str(e)})
+            raise
+        self._write({'kind': kind, 'key': key, 'label': label, 'response': response})
+        return response
+
+# Shared by every provider client so one run lands in one file
+cassette = Cassette()
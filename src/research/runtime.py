@@ -0,0 +1,114 @@
+import asyncio
+import atexit
+import concurrent.futures
+import logging
+import threading
+from typing import AsyncIterator, Awaitable, Callable, Iterator, List, Optional, TypeVar
+
+from .http import http_client
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+class AsyncRuntime:
+    """A single long-lived event loop on a background thread
+
+    Synchronous code (Flask handlers, job workers) submits coroutines here
+    instead of spinning up a loop per call, so connection pools, in-flight
+    request maps and concurrency limits are shared by the whole process.
+    """
+
+    def __init__(self, name: str = 'research-runtime'):
+        self.name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._shutdown_hooks: List[Callable[[], Awaitable]] = []
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """The runtime's loop, started on first use"""
+        with self._lock:
+            if self._loop is None or self._loop.is_closed():
+                loop = asyncio.new_event_loop()
+                started = threading.Event()
+                self._thread = threading.Thread(
+                    target=self._serve, args=(loop, started), name=self.name, daemon=True
+                )
+                self._thread.start()
+                started.wait()
+                self._loop = loop
+            return self._loop
+
+    def _serve(self, loop: asyncio.AbstractEventLoop, started: threading.Event) -> None:
+        asyncio.set_event_loop(loop)
+        loop.call_soon(started.set)
+        loop.run_forever()
+
+    def on_shutdown(self, hook: Callable[[], Awaitable]) -> None:
+        """Register a coroutine function awaited on the loop before it stops"""
+        self._shutdown_hooks.append(hook)
+
+    def submit(self, coro: Awaitable[T]) -> "concurrent.futures.Future[T]":
+        """Schedule a coroutine on the runtime loop; cancelling the future cancels the task"""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro: Awaitable[T], timeout: Optional[float] = None) -> T:
+        """Run a coroutine on the runtime loop and block until it finishes"""
+        future = self.submit(coro)
+        try:
+            return future.result(timeout)
+        except BaseException:
+            # Timeouts, and a caller unwinding for any other reason, must not leave the task behind
+            future.cancel()
+            raise
+
+    def iterate(self, events: AsyncIterator[T]) -> Iterator[T]:
+        """Drive an async iterator from synchronous code, one item at a time"""
+        try:
+            while True:
+                try:
+                    yield self.run(events.__anext__())
+                except StopAsyncIteration:
+                    break
+        finally:
+            # Also runs when the consumer stops early, e.g. a client disconnecting mid-stream
+            self.run(events.aclose())
+
+    def stop(self, timeout: float = 5) -> None:
+        """Run the shutdown hooks, cancel what is left and stop the loop"""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is None or loop.is_closed():
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self._shutdown(), loop).result(timeout)
+        except Exception as e:
+            logger.error(f"Error shutting down async runtime: {str(e)}")
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout)
+        if not loop.is_running():
+            loop.close()
+
+    async def _shutdown(self) -> None:
+        for hook in self._shutdown_hooks:
+            try:
+                await hook()
+            except Exception as e:
+                logger.error(f"Error in runtime shutdown hook: {str(e)}")
+        current = asyncio.current_task()
+        tasks = [task for task in asyncio.all_tasks() if task is not current]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+# Process-wide loop shared by the web routes and the job workers
+runtime = AsyncRuntime()
+runtime.on_shutdown(http_client.close)
+
+def init_app(app):
+    """Stop the shared loop, closing its HTTP session, when the process exits"""
+    app.extensions['runtime'] = runtime
+    atexit.register(runtime.stop)
@@ -0,0 +1,147 @@
+import asyncio
+import functools
+import json
+import logging
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from .cache import TTLCache
+from .concurrency import LoopLocal
+from .config import Config
+from .metrics import span
+from .rate_limit import RateLimiter, rate_limiter
+from .replay import Cassette, cassette as shared_cassette
+
+logger = logging.getLogger(__name__)
+
+_URL_PREFIX = re.compile(r'\bhttps?://(www\.)?|\bwww\.')
+
+def normalize_query(query: str) -> str:
+    """Lowercase, drop URL schemes and trailing slashes, collapse whitespace"""
+    query = _URL_PREFIX.sub('', query.lower())
+    return ' '.join(token.rstrip('/') for token in query.split())
+
+class SearchCache:
+    """Search results keyed by normalized query and search parameters
+
+    Each query falls into the first class whose pattern matches it, and the
+    class decides how long its results stay fresh.
+    """
+
+    def __init__(self, max_bytes: Optional[int] = None,
+                 ttl_rules: Optional[List[Tuple[str, float]]] = None,
+                 default_ttl: Optional[float] = None):
+        self.default_ttl = default_ttl or Config.SEARCH_CACHE_TTL
+        if ttl_rules is None:
+            ttl_rules = [
+                (r'\b(news|recent|latest|developments|announce\w*|press)\b', Config.SEARCH_CACHE_NEWS_TTL),
+                (r'\blinkedin\b', Config.SEARCH_CACHE_PEOPLE_TTL),
+                (r'\b(what does|about|overview|company size|technology stack)\b', Config.SEARCH_CACHE_PROFILE_TTL),
+            ]
+        self.ttl_rules = [(re.compile(pattern), ttl) for pattern, ttl in ttl_rules]
+        self._cache = TTLCache(
+            max_bytes=max_bytes or Config.SEARCH_CACHE_MAX_BYTES,
+            ttl=self.default_ttl,
+            sizeof=lambda key, value: len(key) + len(json.dumps(value))
+        )
+
+    def ttl_for(self, query: str) -> float:
+        normalized = normalize_query(query)
+        for pattern, ttl in self.ttl_rules:
+            if pattern.search(normalized):
+                return ttl
+        return self.default_ttl
+
+    @staticmethod
+    def key(query: str, params: Dict[str, Any]) -> str:
+        return normalize_query(query) + '|' + json.dumps(params, sort_keys=True, default=str)
+
+    def get(self, query: str, params: Dict[str, Any]) -> Optional[List[Dict]]:
+        return self._cache.get(self.key(query, params))
+
+    def set(self, query: str, params: Dict[str, Any], results: List[Dict]) -> None:
+        self._cache.set(self.key(query, params), results, ttl=self.ttl_for(query))
+
+    def stats(self) -> Dict[str, int]:
+        return self._cache.stats()
+
+class SearchClient:
+    """Non-blocking, concurrency-capped wrapper around the Tavily client"""
+
+    def __init__(self, max_concurrency: Optional[int] = None, timeout: Optional[float] = None,
+                 cache: Optional[SearchCache] = None, limiter: RateLimiter = rate_limiter,
+                 cassette: Cassette = shared_cassette):
+        self._client = None
+        self._client_lock = threading.Lock()
+        self.limiter = limiter
+        self.cassette = cassette
+        self.max_concurrency = max_concurrency or Config.SEARCH_MAX_CONCURRENCY
+        self.timeout = timeout or Config.SEARCH_TIMEOUT
+        # Timed-out searches keep their worker thread until Tavily answers,
+        # so leave headroom above the concurrency cap
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_concurrency * 2,
+            thread_name_prefix='tavily-search'
+        )
+        self._semaphore = LoopLocal(lambda: asyncio.Semaphore(self.max_concurrency))
+        self.cache = cache if cache is not None else SearchCache()
+
+    @property
+    def client(self):
+        """The Tavily client, imported and built on first use"""
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    from tavily import TavilyClient
+                    client = TavilyClient(api_key=Config.get_api_key('TAVILY_API_KEY'))
+                    if Config.TAVILY_BASE_URL:
+                        client.base_url = Config.TAVILY_BASE_URL.rstrip('/')
+                    self._client = client
+        return self._client
+
+    def _search(self, query: str, **kwargs) -> Dict:
+        return self.client.search(query, **kwargs)
+
+    async def search(self, query: str, **kwargs) -> List[Dict]:
+        """Run a single search; returns an empty list on error or timeout"""
+        cached = self.cache.get(query, kwargs)
+        if cached is not None:
+            return cached
+
+        loop = asyncio.get_running_loop()
+
+        async def attempt():
+            # Hold a concurrency slot per attempt, so retry backoff does not keep it from other searches
+            async with self._semaphore.get():
+                return await asyncio.wait_for(
+                    loop.run_in_executor(self._executor, functools.partial(self._search, query, **kwargs)),
+                    timeout=self.timeout
+                )
+
+        try:
+            # Each attempt gets its own timeout; throttled attempts are retried
+            with span('tavily_search'):
+                response = await self.cassette.call(
+                    'tavily', {'query': query, **kwargs},
+                    lambda: self.limiter.call('tavily', attempt),
+                    label=query
+                )
+        except asyncio.TimeoutError:
+            logger.warning(f"Search timed out after {self.timeout}s: {query}")
+            return []
+        except Exception as e:
+            logger.error(f"Search failed for '{query}': {str(e)}")
+            return []
+        results = response.get("results", [])
+        # Failures are not cached, so the next caller retries them
+        self.cache.set(query, kwargs, results)
+        return results
+
+    async def search_many(self, queries: List[str], **kwargs) -> List[List[Dict]]:
+        """Run several searches concurrently, preserving query order"""
+        return await asyncio.gather(*(self.search(query, **kwargs) for query in queries))
+
+# Shared client so the search cache and concurrency cap cover every caller
+search_client = SearchClient()
@@ -0,0 +1,169 @@
+import json
+import logging
+import os
+import re
+import threading
+import time
+from typing import Dict, FrozenSet, List, Optional, Tuple
+from .config import Config
+
+logger = logging.getLogger(__name__)
+
+NON_WORD = re.compile(r"[^a-z0-9]+")
+# Fuzzy answers are memoized per catalog version, up to this many categories
+FUZZY_MEMO_SIZE = 10000
+
+def normalize_category(text: str) -> str:
+    """Lowercase a category name and collapse punctuation to single spaces"""
+    return NON_WORD.sub(' ', text.lower().replace('&', ' and ')).strip()
+
+def category_tokens(text: str) -> FrozenSet[str]:
+    """Content words of a category name, with plural "s" stripped"""
+    tokens = set()
+    for token in normalize_category(text).split():
+        if token in ('and', 'or', 'for', 'the', 'of', 'a', 'software', 'system', 'platform', 'tool', 'tools'):
+            continue
+        tokens.add(token[:-1] if len(token) > 3 and token.endswith('s') else token)
+    return frozenset(tokens)
+
+class _CatalogIndex:
+    """Immutable lookup structures for one version of the catalog file"""
+
+    def __init__(self, entries: Dict[str, Dict]):
+        self.entries = entries
+        self.aliases: Dict[str, str] = {}
+        # Word sets of every key, name and alias, each pointing back at its entry
+        self.names: List[Tuple[str, FrozenSet[str]]] = []
+        self.postings: Dict[str, List[int]] = {}
+        self.fuzzy: Dict[str, Optional[str]] = {}
+
+        for key, entry in entries.items():
+            names = [key, entry.get('name', '')] + list(entry.get('aliases', []))
+            for name in names:
+                if not isinstance(name, str) or not name:
+                    continue
+                # The first entry to claim an alias keeps it
+                self.aliases.setdefault(normalize_category(name), key)
+                tokens = category_tokens(name)
+                for token in tokens:
+                    self.postings.setdefault(token, []).append(len(self.names))
+                self.names.append((key, tokens))
+
+    def match(self, category: str, min_similarity: float) -> Optional[str]:
+        """Return the catalog key for a category, exact or fuzzy"""
+        if category in self.entries:
+            return category
+        normalized = normalize_category(category)
+        key = self.aliases.get(normalized)
+        if key is not None:
+            return key
+        if normalized in self.fuzzy:
+            return self.fuzzy[normalized]
+
+        query = category_tokens(category)
+        # Count shared words through the postings instead of intersecting every name's word set
+        overlaps: Dict[int, int] = {}
+        for token in query:
+            for name_id in self.postings.get(token, ()):
+                overlaps[name_id] = overlaps.get(name_id, 0) + 1
+        best, best_score = None, 0.0
+        for name_id, shared in overlaps.items():
+            candidate, tokens = self.names[name_id]
+            score = shared / (len(query) + len(tokens) - shared)
+            if score > best_score:
+                best, best_score = candidate, score
+        key = best if best_score >= min_similarity else None
+        # Racing writers store the same answer, so no lock is needed
+        if len(self.fuzzy) >= FUZZY_MEMO_SIZE:
+            self.fuzzy.clear()
+        self.fuzzy[normalized] = key
+        return key
+
+class SolutionCatalog:
+    """Solutions keyed by software category, with alias and fuzzy lookup
+
+    Lookups match the exact key first, then normalized names and aliases
+    (each entry may list ``aliases``), then the entry with a key, name or alias
+    sharing the most words with the requested category. The file is re-read in a
+    background thread when its mtime changes; lookups keep using the previous
+    version until the new one is ready.
+    """
+
+    def __init__(self, path: Optional[str] = None, reload_interval: Optional[float] = None,
+                 min_similarity: Optional[float] = None):
+        self.path = path or Config.SOLUTIONS_PATH
+        self.reload_interval = Config.SOLUTIONS_RELOAD_INTERVAL if reload_interval is None else reload_interval
+        self.min_similarity = Config.SOLUTIONS_MIN_SIMILARITY if min_similarity is None else min_similarity
+        self._lock = threading.Lock()
+        self._loading = False
+        self._checked_at = time.monotonic()
+        self._mtime = self._stat()
+        self._index = _CatalogIndex(self._load() or {})
+
+    def __len__(self) -> int:
+        return len(self._index.entries)
+
+    def get(self, category: str) -> Dict:
+        """Return the solution for a category, or an empty dict if nothing matches"""
+        self._maybe_reload()
+        index = self._index
+        key = index.match(category, self.min_similarity)
+        if key is None:
+            return {}
+        if key != category:
+            logger.debug(f"Matched solution category '{category}' to '{key}'")
+        return index.entries[key]
+
+    def categories(self) -> List[str]:
+        return list(self._index.entries)
+
+    def _stat(self) -> Optional[float]:
+        try:
+            return os.stat(self.path).st_mtime
+        except OSError:
+            return None
+
+    def _load(self) -> Optional[Dict[str, Dict]]:
+        """Read the catalog file; returns None if it is missing or invalid"""
+        try:
+            with open(self.path, "r") as f:
+                entries = json.load(f)
+        except FileNotFoundError:
+            logger.error(f"{self.path} not found")
+            return None
+        except json.JSONDecodeError:
+            logger.error(f"Invalid JSON in {self.path}")
+            return None
+        if not isinstance(entries, dict):
+            logger.error(f"Expected an object of categories in {self.path}")
+            return None
+        return {key: entry for key, entry in entries.items() if isinstance(entry, dict)}
+
+    def _maybe_reload(self):
+        now = time.monotonic()
+        if now - self._checked_at < self.reload_interval:
+            return
+        with self._lock:
+            if self._loading or now - self._checked_at < self.reload_interval:
+                return
+            self._checked_at = now
+            mtime = self._stat()
+            if mtime == self._mtime:
+                return
+            self._loading = True
+        threading.Thread(target=self._reload, args=(mtime,), daemon=True).start()
+
+    def _reload(self, mtime: Optional[float]):
+        try:
+            entries = self._load()
+            if entries is not None:
+                self._index = _CatalogIndex(entries)
+                logger.info(f"Reloaded {len(entries)} solutions from {self.path}")
+            elif mtime is None:
+                # The file is gone: stop matching against stale entries
+                self._index = _CatalogIndex({})
+            # Keep the previous index when the new file does not parse
+            self._mtime = mtime
+        finally:
+            with self._lock:
+                self._loading = False
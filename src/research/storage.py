@@ -0,0 +1,116 @@
+import asyncio
+import functools
+import logging
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+
+from .config import Config
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+# SQLite calls block, including busy waits on a locked database, so coroutines
+# run them here rather than on the shared event loop. One thread also
+# serializes writes, which SQLite would do anyway.
+_db_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='sqlite')
+
+# Tables in the shared database; created by db.init_app and on first connect
+SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS page_cache (
+        url TEXT PRIMARY KEY,
+        content TEXT NOT NULL,
+        etag TEXT,
+        last_modified TEXT,
+        fetched_at REAL NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS llm_cache (
+        key TEXT PRIMARY KEY,
+        model TEXT NOT NULL,
+        content TEXT NOT NULL,
+        created_at REAL NOT NULL,
+        expires_at REAL NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_llm_cache_expires_at ON llm_cache (expires_at)",
+    """
+    CREATE TABLE IF NOT EXISTS jobs (
+        id TEXT PRIMARY KEY,
+        website TEXT NOT NULL,
+        titles TEXT NOT NULL,
+        status TEXT NOT NULL,
+        result TEXT,
+        error TEXT,
+        created_at REAL NOT NULL,
+        updated_at REAL NOT NULL,
+        worker_id TEXT,
+        heartbeat_at REAL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, created_at)",
+    """
+    CREATE TABLE IF NOT EXISTS email_cache (
+        key TEXT PRIMARY KEY,
+        email TEXT,
+        source TEXT NOT NULL,
+        found INTEGER NOT NULL,
+        created_at REAL NOT NULL,
+        expires_at REAL NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS email_pattern_domains (
+        domain TEXT PRIMARY KEY,
+        observations INTEGER NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS email_patterns (
+        domain TEXT NOT NULL,
+        pattern TEXT NOT NULL,
+        hits INTEGER NOT NULL,
+        PRIMARY KEY (domain, pattern)
+    )
+    """,
+]
+
+# Columns added after their table first shipped, as (table, column, definition)
+ADDED_COLUMNS = [
+    ('jobs', 'worker_id', 'TEXT'),
+    ('jobs', 'heartbeat_at', 'REAL'),
+]
+
+def init_schema(conn: sqlite3.Connection) -> None:
+    """Create any missing tables and add columns missing from older databases"""
+    for statement in SCHEMA:
+        conn.execute(statement)
+    for table, column, definition in ADDED_COLUMNS:
+        existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+        if column not in existing:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+    conn.commit()
+
+async def run_db(func: Callable[..., T], *args: Any, default: Optional[T] = None, **kwargs: Any) -> Optional[T]:
+    """Run a blocking cache call on the database thread
+
+    A database error (e.g. the file stays locked past the busy timeout) is
+    logged and returns ``default``, so a cache read degrades to a miss and a
+    write is skipped.
+    """
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(_db_executor, functools.partial(func, *args, **kwargs))
+    except sqlite3.Error as e:
+        logger.warning(f"Database call {getattr(func, '__qualname__', func)} failed: {str(e)}")
+        return default
+
+def connect(path: Optional[str] = None) -> sqlite3.Connection:
+    """Open a connection usable from worker threads and event loops"""
+    conn = sqlite3.connect(path or Config.DATABASE_PATH, timeout=10, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    init_schema(conn)
+    return conn
@@ -1,54 +1,181 @@
 import aiohttp
 import asyncio
-from bs4 import BeautifulSoup
+import codecs
 import logging
-from typing import Optional, Dict, List
+import re
+from typing import Optional, Dict, List, Tuple
 from urllib.parse import urlparse
 from aiohttp import ClientTimeout
+from .cache import TTLCache
+from .concurrency import LoopLocal
+from .config import Config
+from .extraction import ExtractionPool
+from .http import HttpClient, http_client
+from .page_store import PageStore
+from .storage import run_db
+from .rate_limit import RateLimiter, RateLimitError, THROTTLE_STATUSES, parse_retry_after, rate_limiter
+from .replay import Cassette, cassette as shared_cassette
+
+logger = logging.getLogger(__name__)
+
+HTML_CONTENT_TYPES = ('text/html', 'application/xhtml+xml')
+CHUNK_SIZE = 64 * 1024
+# Browsers only look this far into a document for a <meta> charset declaration
+CHARSET_SNIFF_BYTES = 1024
+META_CHARSET = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?\s*([a-zA-Z0-9_.:-]+)', re.IGNORECASE)
+
+def detect_charset(body: bytes, header_charset: Optional[str] = None) -> str:
+    """Pick a decoder from the Content-Type charset, a BOM or a <meta> tag, falling back to utf-8"""
+    candidates = [header_charset]
+    if body.startswith(codecs.BOM_UTF8):
+        candidates.append('utf-8-sig')
+    elif body.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        candidates.append('utf-16')
+    match = META_CHARSET.search(body[:CHARSET_SNIFF_BYTES])
+    if match:
+        candidates.append(match.group(1).decode('ascii'))
+    for candidate in candidates:
+        if not candidate:
+            continue
+        try:
+            return codecs.lookup(candidate).name
+        except LookupError:
+            continue
+    return 'utf-8'
 
 class WebScraper:
-    def __init__(self):
-        self._cache: Dict[str, str] = {}
+    def __init__(self, http: HttpClient = http_client, store: Optional[PageStore] = None,
+                 limiter: RateLimiter = rate_limiter, extractor: Optional[ExtractionPool] = None,
+                 cassette: Cassette = shared_cassette):
+        self.http = http
+        self.limiter = limiter
+        # Records the raw HTML, so replays still exercise the parser
+        self.cassette = cassette
+        # Parsing runs in worker processes, off the event loop
+        self.extractor = extractor if extractor is not None else ExtractionPool()
+        # Survives restarts; entries are revalidated with conditional GETs
+        self.store = store if store is not None else PageStore()
+        self._cache = TTLCache(max_bytes=Config.PAGE_CACHE_MAX_BYTES, ttl=Config.PAGE_CACHE_TTL)
+        # Fetches currently running on each loop, so concurrent callers share one request
+        self._in_flight: LoopLocal[Dict[str, asyncio.Future]] = LoopLocal(dict)
+        # Per-host fetch slots on each loop, so one site cannot hog the pool
+        self._host_slots: LoopLocal[Dict[str, asyncio.Semaphore]] = LoopLocal(dict)
+        self.max_bytes = Config.SCRAPE_MAX_BYTES
+        self.max_per_host = Config.SCRAPE_MAX_PER_HOST
         self.timeout = ClientTimeout(total=10)
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         }
 
     async def get_pages_content(self, urls: List[str]) -> Dict[str, Optional[str]]:
-        """Fetch multiple pages concurrently"""
-        async with aiohttp.ClientSession(headers=self.headers, timeout=self.timeout) as session:
-            tasks = [self._fetch_page(session, url) for url in urls]
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-            return {url: result for url, result in zip(urls, results) if not isinstance(result, Exception)}
+        """Fetch multiple pages concurrently over the shared connection pool"""
+        session = self.http.session()
+        tasks = [self._fetch_page(session, url) for url in urls]
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        return {url: result for url, result in zip(urls, results) if not isinstance(result, Exception)}
 
     async def get_page_content(self, url: str) -> Optional[str]:
         """Backwards compatibility method for single page fetch"""
         results = await self.get_pages_content([url])
         return results.get(url)
 
+    def cache_stats(self) -> Dict[str, int]:
+        """Return page cache hit/miss/eviction counters"""
+        return self._cache.stats()
+
     async def _fetch_page(self, session: aiohttp.ClientSession, url: str) -> Optional[str]:
+        """Return a page from the cache, joining any fetch already in flight"""
+        cached = self._cache.get(url)
+        if cached is not None:
+            return cached
+
+        in_flight = self._in_flight.get()
+        future = in_flight.get(url)
+        if future is None:
+            future = in_flight[url] = asyncio.ensure_future(self._download_page(session, url))
+            future.add_done_callback(lambda _: in_flight.pop(url, None))
+        # Shield the shared fetch so one cancelled caller does not cancel it for the rest
+        return await asyncio.shield(future)
+
+    def _host_slot(self, hostname: str) -> asyncio.Semaphore:
+        """Return the semaphore bounding concurrent fetches to a host"""
+        slots = self._host_slots.get()
+        slot = slots.get(hostname)
+        if slot is None:
+            slot = slots[hostname] = asyncio.Semaphore(self.max_per_host)
+        return slot
+
+    async def _read_body(self, response: aiohttp.ClientResponse, url: str) -> bytes:
+        """Stream the response body, stopping once max_bytes have been read"""
+        body = bytearray()
+        async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+            body.extend(chunk[:self.max_bytes - len(body)])
+            if len(body) >= self.max_bytes:
+                logger.info(f"Truncated {url} at {self.max_bytes} bytes")
+                break
+        return bytes(body)
+
+    async def _request(self, session: aiohttp.ClientSession, url: str,
+                       headers: Dict[str, str]) -> Tuple[int, Optional[str], Optional[str], Optional[str]]:
+        """GET a page; returns (status, html, etag, last_modified) and raises RateLimitError when throttled
+
+        html is None for non-HTML responses, which are dropped without reading the body.
+        """
+        async with session.get(url, headers=headers, timeout=self.timeout) as response:
+            if response.status in THROTTLE_STATUSES:
+                raise RateLimitError(
+                    f"{url} throttled ({response.status})",
+                    retry_after=parse_retry_after(response.headers.get('Retry-After'))
+                )
+            if response.status != 200:
+                return response.status, None, None, None
+            # A missing Content-Type is given the benefit of the doubt
+            if 'Content-Type' in response.headers and response.content_type not in HTML_CONTENT_TYPES:
+                logger.info(f"Skipping {url}: not HTML ({response.content_type})")
+                return response.status, None, None, None
+            body = await self._read_body(response, url)
+            html = body.decode(detect_charset(body, response.charset), errors='replace')
+            return response.status, html, response.headers.get('ETag'), response.headers.get('Last-Modified')
+
+    async def _download_page(self, session: aiohttp.ClientSession, url: str) -> Optional[str]:
         """Fetch and parse a single page"""
         try:
-            if url in self._cache:
-                return self._cache[url]
-
             parsed = urlparse(url)
             if not parsed.scheme.startswith('http'):
                 return None
 
-            async with session.get(url) as response:
-                if response.status != 200:
-                    return None
-                html = await response.text()
-                
-            soup = BeautifulSoup(html, 'html.parser')
-            for tag in soup(['script', 'style', 'nav', 'footer']):
-                tag.decompose()
-            
-            content = ' '.join([p.get_text().strip() for p in soup.find_all(['p', 'h1', 'h2', 'h3', 'li'])])
-            content = ' '.join(content.split())
+            stored = await run_db(self.store.get, url)
+            headers = dict(self.headers)
+            if stored:
+                if stored.etag:
+                    headers['If-None-Match'] = stored.etag
+                if stored.last_modified:
+                    headers['If-Modified-Since'] = stored.last_modified
+
+            async def fetch():
+                # Hold the host slot per attempt, so retry backoff does not block other fetches
+                async with self._host_slot(parsed.hostname):
+                    return await self._request(session, url, headers)
+
+            status, html, etag, last_modified = await self.cassette.call(
+                'page', {'url': url},
+                lambda: self.limiter.call(f"host:{parsed.hostname}", fetch),
+                label=url
+            )
+            if status == 304 and stored:
+                # Unchanged since last fetch: skip both the download and the parse
+                await run_db(self.store.touch, url)
+                self._cache.set(url, stored.content)
+                return stored.content
+            if status != 200 or html is None:
+                return None
+
+            content = await self.extractor.extract(html)
             
-            self._cache[url] = content
+            self._cache.set(url, content)
+            # Pages without validators cannot be revalidated, so there is no point keeping them
+            if etag or last_modified:
+                await run_db(self.store.put, url, content, etag, last_modified)
             return content
 
         except Exception as e:
@@ -1,10 +1,20 @@
-from flask import Blueprint, render_template, request, jsonify
-from src.research.agent import research_agent
-import asyncio
-import nest_asyncio
+from flask import Blueprint, Response, current_app, render_template, request, jsonify, stream_with_context
+from src.research.agent import get_research_agent
+from src.research.bulk import BulkRunner, Checkpoint, detect_format, read_rows
+from src.research.config import Config
+from src.research.runtime import runtime
+from src.research.metrics import registry
+from src.jobs import get_job_queue
+from typing import Optional
+import codecs
+import hashlib
+import io
+import json
+import logging
+import os
+import tempfile
 
-# Apply nest_asyncio to allow nested event loops
-nest_asyncio.apply()
+logger = logging.getLogger(__name__)
 
 main = Blueprint('main', __name__)
 
@@ -21,16 +31,10 @@ def research():
         return jsonify({'error': 'Both website URL and titles are required'}), 400
 
     try:
-        # Create new event loop for this thread
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
+        # Runs on the shared loop, so pooled connections and limits outlive the request
+        result = runtime.run(get_research_agent().process_company(website, titles))
         
-        # Use process_company instead of run
-        result = loop.run_until_complete(
-            research_agent.process_company(website, titles)
-        )
-        
-        print("Result from research_agent.process_company:", result)  # Log the result
+        logger.debug(f"Research result for {website}: {result}")
         
         return jsonify({
             'success': True,
@@ -41,5 +45,107 @@ def research():
             'error': str(e),
             'success': False
         }), 500
-    finally:
-        loop.close()
\ No newline at end of file
+
+def _sse(event: str, data: dict) -> str:
+    """Format one Server-Sent Events message"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@main.route('/research/stream', methods=['POST'])
+def research_stream():
+    website = request.form.get('website')
+    titles = request.form.get('titles')
+
+    if not website or not titles:
+        return jsonify({'error': 'Both website URL and titles are required'}), 400
+
+    def generate():
+        try:
+            for event, data in runtime.iterate(get_research_agent().process_company_stream(website, titles)):
+                yield _sse(event, data)
+        except Exception as e:
+            yield _sse('error', {'error': str(e)})
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+def _upload_digest(f) -> Optional[str]:
+    """SHA-256 of a binary file, or None if it is not valid UTF-8; reads it in chunks"""
+    f.seek(0)
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    digest = hashlib.sha256()
+    try:
+        for chunk in iter(lambda: f.read(64 * 1024), b''):
+            decoder.decode(chunk)
+            digest.update(chunk)
+        decoder.decode(b'', final=True)
+    except UnicodeDecodeError:
+        return None
+    return digest.hexdigest()
+
+@main.route('/bulk', methods=['POST'])
+def bulk_research():
+    upload = request.files.get('file')
+    if upload is None or not upload.filename:
+        return jsonify({'error': 'A CSV or JSONL file is required'}), 400
+
+    fmt = request.form.get('format') or detect_format(upload.filename)
+    # The upload is closed with the request, so spool it for the streamed response
+    spooled = tempfile.TemporaryFile()
+    upload.save(spooled)
+    digest = _upload_digest(spooled)
+    if digest is None:
+        spooled.close()
+        return jsonify({'error': 'The file must be UTF-8 encoded'}), 400
+    spooled.seek(0)
+    source = io.TextIOWrapper(spooled, encoding='utf-8', newline='')
+
+    # Uploading the same file again resumes it, skipping rows that already succeeded
+    checkpoint_path = os.path.join(Config.BULK_CHECKPOINT_DIR, f"{digest}.checkpoint")
+    if request.form.get('restart') == 'true' and os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+    checkpoint = Checkpoint(checkpoint_path)
+    runner = BulkRunner(get_research_agent(), checkpoint=checkpoint)
+
+    def generate():
+        # One JSON line per company, written as soon as it finishes
+        try:
+            for record in runtime.iterate(runner.run(read_rows(source, fmt))):
+                yield json.dumps(record) + '\n'
+        finally:
+            checkpoint.close()
+            source.close()
+
+    return Response(generate(), mimetype='application/x-ndjson',
+                    headers={'X-Bulk-Batch': digest, 'X-Bulk-Resumed-Rows': str(len(checkpoint.done))})
+
+@main.route('/jobs', methods=['POST'])
+def submit_job():
+    website = request.form.get('website')
+    titles = request.form.get('titles')
+
+    if not website or not titles:
+        return jsonify({'error': 'Both website URL and titles are required'}), 400
+
+    job = get_job_queue(current_app).submit(website, titles)
+    return jsonify({'job_id': job['id'], 'status': job['status']}), 202
+
+@main.route('/jobs/<job_id>', methods=['GET'])
+def job_status(job_id):
+    job = get_job_queue(current_app).store.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job)
+
+@main.route('/jobs/<job_id>', methods=['DELETE'])
+def cancel_job(job_id):
+    job_queue = get_job_queue(current_app)
+    if job_queue.store.get(job_id) is None:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify({'job_id': job_id, 'cancelled': job_queue.cancel(job_id)})
+
+@main.route('/metrics', methods=['GET'])
+def metrics():
+    return Response(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -0,0 +1,37 @@
+import pytest
+
+from src.research.extraction import default_backend, extract_text, extract_text_bs4, extract_text_lxml, extract_text_stream
+
+XHTML = (
+    '<?xml version="1.0" encoding="utf-8"?>\n'
+    '<!DOCTYPE html PUBLIC "-//W3C//DTD XHTML 1.0 Strict//EN" '
+    '"http://www.w3.org/TR/xhtml1/DTD/xhtml1-strict.dtd">\n'
+    '<html xmlns="http://www.w3.org/1999/xhtml"><body>'
+    '<h1>Acme</h1><p>We build <b>rockets</b>.</p><ul><li>Fast</li><li>Safe</li></ul>'
+    '</body></html>'
+)
+
+PAGES = [
+    '<p>a<p>b</p>c',
+    '<ul><li>one<li>two</ul>',
+    '<h1>Title<p>body</h1> tail',
+    '<p>kept<script>var x = 1;</script> too</p><nav><p>menu</p></nav>',
+    '<div><p>caf&eacute; &amp; more</div></p>',
+    XHTML,
+    '<!-- only a comment -->',
+    '',
+]
+
+@pytest.mark.parametrize('html', PAGES)
+def test_stream_matches_bs4(html):
+    assert extract_text_stream(html) == extract_text_bs4(html)
+
+def test_default_backend_is_stream(monkeypatch):
+    monkeypatch.setattr('src.research.config.Config.EXTRACTION_BACKEND', '')
+    assert default_backend() == 'stream'
+    assert extract_text('<p>a<p>b</p>c') == extract_text_bs4('<p>a<p>b</p>c')
+
+@pytest.mark.parametrize('html', [XHTML, '<!-- only a comment -->', '   '])
+def test_lxml_handles_xhtml_and_empty_documents(html):
+    pytest.importorskip('lxml')
+    assert extract_text_lxml(html) == extract_text_bs4(html)
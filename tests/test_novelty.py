@@ -0,0 +1,37 @@
+from src.research.novelty import NoveltyTracker
+
+def make_batch(prefix, count=4):
+    return [
+        {'url': f'https://{prefix}.example/{i}', 'title': f'{prefix} {i}',
+         'content': f'{prefix} report {i} covers product launches, hiring and funding round {i}'}
+        for i in range(count)
+    ]
+
+def test_empty_batch_is_not_an_observation():
+    tracker = NoveltyTracker(threshold=0.2, max_loops=5, max_tokens=100000)
+
+    assert tracker.observe([], []) == []
+    assert tracker.last_novelty is None
+    assert tracker.loops == 0
+    assert tracker.stop_reason() is None
+
+def test_empty_batch_after_novel_batch_keeps_going():
+    tracker = NoveltyTracker(threshold=0.2, max_loops=5, max_tokens=100000)
+    sources = []
+    sources.extend(tracker.observe(make_batch('alpha'), sources))
+    novelty = tracker.last_novelty
+
+    tracker.observe([], sources, 'summary so far')
+
+    assert tracker.last_novelty == novelty
+    assert tracker.stop_reason() is None
+
+def test_repeated_batch_stops_research():
+    tracker = NoveltyTracker(threshold=0.2, max_loops=5, max_tokens=100000)
+    sources = []
+    batch = make_batch('alpha')
+    sources.extend(tracker.observe(batch, sources))
+
+    assert tracker.observe(batch, sources) == []
+    assert tracker.last_novelty < 0.2
+    assert tracker.stop_reason().startswith('novelty')